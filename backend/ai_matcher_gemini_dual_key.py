@@ -1,24 +1,41 @@
 import os
-import time
 import json
+import asyncio
+import shelve
+import hashlib
 import logging
+import ijson
 import pandas as pd
 import google.generativeai as genai
 from dotenv import load_dotenv
+from typing import get_type_hints, get_origin, get_args
+from typing_extensions import TypedDict
 
 # --- CONFIGURATION ---
 load_dotenv()
 genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 
-# Step 1: Use 1.5 Pro for its huge context window (to read 50 jobs at once)
-RANKING_MODEL_NAME = "gemini-1.5-pro" 
-# Step 2: Use 3.0 Pro (or 1.5 Pro) for high-quality writing
-WRITING_MODEL_NAME = "gemini-1.5-pro" # Switch to "gemini-3-pro-preview" if available
+# Ranking + writing happen in ONE request, so we need 1.5 Pro's huge context window
+# (full descriptions for every job) and its writing quality at the same time.
+MODEL_NAME = "gemini-1.5-pro" # Switch to "gemini-3-pro-preview" if available
 
 INPUT_FILE = "scraped_jobs.xlsx"
 OUTPUT_DIR = "top_matched_resumes"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# 1.5 Pro takes ~1M input tokens. Cap the job list below that to leave room for the prompt + answer.
+MAX_JOB_LIST_TOKENS = 900_000
+
+# On-disk cache of AI responses. Re-running on an unchanged job list costs zero API calls.
+CACHE_FILE = ".resume_cache"
+
+# Batch API: 50% cheaper and no RPM throttling, but results can take up to 24h.
+# Fine for an offline run you check later. Set False for an immediate answer.
+USE_BATCH_API = False
+BATCH_FILE = "resume_batch.jsonl"
+BATCH_POLL_SECONDS = 60
+BATCH_DONE_STATES = {"JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+
 # Logger
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 logger = logging.getLogger()
@@ -37,102 +54,206 @@ PROJECTS:
 SKILLS: Python, C++, Java, SQL, React, ROS, Git, Docker, OpenCV, Pandas.
 """
 
-def rank_jobs(df):
+# --- RESPONSE SCHEMA (Gemini is forced to return exactly this structure) ---
+class ExperienceBullet(TypedDict):
+    company: str
+    bullet: str
+
+class TailoredMatch(TypedDict):
+    id: str
+    tailored_summary: str
+    key_skills: list[str]
+    experience_bullets: list[ExperienceBullet]
+    cover_letter_hook: str
+
+class RankingResult(TypedDict):
+    top_5: list[TailoredMatch]
+    reasoning: str
+
+def to_json_schema(tp):
+    """
+    Turns the TypedDicts above into the plain JSON schema the Batch API file format expects.
+    """
+    if get_origin(tp) is list:
+        return {"type": "ARRAY", "items": to_json_schema(get_args(tp)[0])}
+    if tp is str:
+        return {"type": "STRING"}
+    fields = get_type_hints(tp)
+    return {"type": "OBJECT", "properties": {k: to_json_schema(v) for k, v in fields.items()}, "required": list(fields)}
+
+async def run_batch_job(prompt):
     """
-    Step 1: Sends ALL job summaries to AI and asks for the Top 5 matches.
+    Submits the prompt through the Gemini Batch API and waits for the result.
     """
-    logger.info(f"📊 PHASE 1: Ranking {len(df)} jobs...")
+    # Newer SDK, only it exposes the Batch API. Imported here so it's only needed when USE_BATCH_API is on.
+    from google import genai as genai_batch
+    client = genai_batch.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+
+    request = {
+        "key": "top_matches",
+        "request": {
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generation_config": {
+                "response_mime_type": "application/json",
+                "response_schema": to_json_schema(RankingResult)
+            }
+        }
+    }
+    with open(BATCH_FILE, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(request) + "\n")
+
+    # The SDK calls are blocking; keep them off the event loop
+    uploaded = await asyncio.to_thread(client.files.upload, file=BATCH_FILE, config={"mime_type": "jsonl"})
+    batch_job = await asyncio.to_thread(client.batches.create, model=MODEL_NAME, src=uploaded.name)
+    logger.info(f"📨 Batch job submitted: {batch_job.name}. Polling every {BATCH_POLL_SECONDS}s...")
+
+    while batch_job.state.name not in BATCH_DONE_STATES:
+        await asyncio.sleep(BATCH_POLL_SECONDS)
+        batch_job = await asyncio.to_thread(client.batches.get, name=batch_job.name)
+        logger.info(f"⏳ Batch state: {batch_job.state.name}")
+
+    if batch_job.state.name != "JOB_STATE_SUCCEEDED":
+        raise RuntimeError(f"Batch job ended with state {batch_job.state.name}")
+
+    content = (await asyncio.to_thread(client.files.download, file=batch_job.dest.file_name)).decode("utf-8")
+    for line in content.splitlines():
+        item = json.loads(line)
+        if item.get("key") == "top_matches":
+            if "error" in item:
+                raise RuntimeError(item["error"])
+            return json.loads(item["response"]["candidates"][0]["content"]["parts"][0]["text"])
 
-    # Prepare a lightweight list of jobs (ID + Title + Summary only) to save tokens
-    jobs_summary_text = ""
-    for index, row in df.iterrows():
-        # specific format for the AI to parse easily
-        jobs_summary_text += f"ID: {row['Job ID']} | TITLE: {row['Job Title']} | SUMMARY: {row['Summary'][:300]}...\n"
+    raise RuntimeError("Batch output did not contain our request.")
 
-    prompt = f"""
-    You are an expert technical recruiter. I have a list of {len(df)} job openings and a candidate's resume.
+async def stream_ranking(model, prompt, on_match):
+    """
+    Streams the AI response and hands each finished match to on_match as soon as
+    its JSON object closes, instead of waiting for the whole response.
+    """
+    finished_matches = ijson.sendable_list()
+    parser = ijson.items_coro(finished_matches, "top_5.item")
+    chunks = []
+
+    response = await model.generate_content_async(
+        prompt,
+        stream=True,
+        generation_config=genai.GenerationConfig(
+            response_mime_type="application/json",
+            response_schema=RankingResult
+        )
+    )
+    async for chunk in response:
+        chunks.append(chunk.text)
+        parser.send(chunk.text.encode("utf-8"))
+        for match in finished_matches:
+            on_match(match)
+        del finished_matches[:]
+    parser.close()
+
+    return json.loads("".join(chunks))
+
+def build_jobs_text(df, max_field_chars=None):
+    """
+    Formats every job as a text block using vectorized pandas string ops (no iterrows).
+    """
+    # fillna first: str.cat() drops rows with a NaN anywhere, and astype(str) alone can turn NaN into "nan"
+    fields = {col: df[col].fillna("").astype(str) for col in ("Summary", "Responsibilities", "Skills")}
+    if max_field_chars is not None:
+        fields = {col: text.str.slice(0, max_field_chars) for col, text in fields.items()}
+
+    blocks = (
+        "ID: " + df['Job ID'].fillna("").astype(str) + " | TITLE: " + df['Job Title'].fillna("").astype(str) + "\n"
+        + "SUMMARY: " + fields["Summary"] + "\n"
+        + "RESPONSIBILITIES: " + fields["Responsibilities"] + "\n"
+        + "SKILLS: " + fields["Skills"] + "\n---\n"
+    )
+    return blocks.str.cat()
+
+def build_prompt(num_jobs, jobs_text):
+    return f"""
+    You are an expert technical recruiter and a professional resume writer. I have a list of {num_jobs} job openings and a candidate's resume.
     
     YOUR GOAL:
-    Identify the Top 5 jobs that are the best fit for this candidate.
-    Prioritize roles where the candidate's "Computer Engineering" and "Robotics" background provides a unique advantage (e.g., automation, data analysis, scripting), even if the job is in a different field (like Transit or Operations).
+    1. Identify the Top 5 jobs that are the best fit for this candidate.
+       Prioritize roles where the candidate's "Computer Engineering" and "Robotics" background provides a unique advantage (e.g., automation, data analysis, scripting), even if the job is in a different field (like Transit or Operations).
+    2. For EACH of those 5 jobs, rewrite the resume to better match that job.
+    
+    WRITING INSTRUCTIONS:
+    1. Pivot the experience: Frame robotics/coding skills as "Process Automation" or "Data Analysis" if relevant.
+    2. Do not invent facts.
+    3. Generate a "Summary of Qualifications" section (tailored_summary).
     
     CANDIDATE RESUME:
     {BASE_RESUME}
     
     JOB LIST:
-    {jobs_summary_text}
+    {jobs_text}
     
     OUTPUT FORMAT (JSON ONLY):
     {{
-        "top_5_ids": ["ID1", "ID2", "ID3", "ID4", "ID5"],
+        "top_5": [
+            {{
+                "id": "ID1",
+                "tailored_summary": "...",
+                "key_skills": ["...", "..."],
+                "experience_bullets": [{{"company": "...", "bullet": "..."}}],
+                "cover_letter_hook": "..."
+            }}
+        ],
         "reasoning": "Brief explanation of why these 5 were chosen"
     }}
     """
 
-    try:
-        model = genai.GenerativeModel(RANKING_MODEL_NAME)
-        response = model.generate_content(
-            prompt,
-            generation_config={"response_mime_type": "application/json"}
-        )
-        return json.loads(response.text)
-    except Exception as e:
-        logger.error(f"❌ Ranking failed: {e}")
-        return None
-
-def write_tailored_resume(job_row):
-    """
-    Step 2: Writes the full resume for a single job.
+async def rank_jobs(model, df, on_match):
     """
-    job_title = job_row['Job Title']
-    logger.info(f"✍️ PHASE 2: Writing tailored resume for: {job_title}...")
-
-    job_context = f"""
-    TITLE: {job_title}
-    SUMMARY: {job_row['Summary']}
-    RESPONSIBILITIES: {job_row['Responsibilities']}
-    SKILLS: {job_row['Skills']}
+    Sends ALL jobs to AI in a single request. The AI picks the Top 5 matches
+    AND writes the tailored resume for each of them in the same response.
+    on_match is called once per tailored match.
     """
+    logger.info(f"📊 Ranking {len(df)} jobs and writing the Top 5 resumes...")
 
-    prompt = f"""
-    You are a professional resume writer. Rewrite this Computer Engineering resume to better match the job below.
-    
-    JOB DESCRIPTION:
-    {job_context}
+    # Full descriptions are included so the AI can tailor the resumes without a second call
+    jobs_text = build_jobs_text(df)
 
-    RESUME:
-    {BASE_RESUME}
+    # Same model + schema + full prompt (instructions, resume, untruncated job list) = same answer,
+    # so reuse it if we already paid for it. Checked before counting tokens, so a cached rerun makes no API calls.
+    schema_text = json.dumps(to_json_schema(RankingResult), sort_keys=True)
+    cache_key = hashlib.sha256((MODEL_NAME + schema_text + build_prompt(len(df), jobs_text)).encode()).hexdigest()
+    with shelve.open(CACHE_FILE) as cache:
+        if cache_key in cache:
+            logger.info("♻️ Job list unchanged since last run. Using cached AI response.")
+            result = cache[cache_key]
+            for match in result.get("top_5", []):
+                on_match(match)
+            return result
 
-    INSTRUCTIONS:
-    1. Pivot the experience: Frame robotics/coding skills as "Process Automation" or "Data Analysis" if relevant.
-    2. Do not invent facts.
-    3. Generate a "Summary of Qualifications" section.
-    
-    Output JSON:
-    {{
-        "tailored_summary": "...",
-        "key_skills": ["...", "..."],
-        "experience_bullets": [{{"company": "...", "bullet": "..."}}],
-        "cover_letter_hook": "..."
-    }}
-    """
-    
     try:
-        model = genai.GenerativeModel(WRITING_MODEL_NAME)
-        response = model.generate_content(
-            prompt,
-            generation_config={"response_mime_type": "application/json"}
-        )
-        return json.loads(response.text)
+        # Count tokens once; if the list is too big, shrink every description evenly instead of erroring out
+        token_count = (await model.count_tokens_async(jobs_text)).total_tokens
+        if token_count > MAX_JOB_LIST_TOKENS:
+            max_field_chars = int(len(jobs_text) * MAX_JOB_LIST_TOKENS / token_count / (3 * len(df)))
+            logger.warning(f"⚠️ Job list is {token_count} tokens. Truncating each field to {max_field_chars} chars.")
+            jobs_text = build_jobs_text(df, max_field_chars)
+        prompt = build_prompt(len(df), jobs_text)
+
+        if USE_BATCH_API:
+            result = await run_batch_job(prompt)
+            for match in result.get("top_5", []):
+                on_match(match)
+        else:
+            result = await stream_ranking(model, prompt, on_match)
+        with shelve.open(CACHE_FILE) as cache:
+            cache[cache_key] = result
+        return result
     except Exception as e:
-        logger.error(f"❌ Writing failed for {job_title}: {e}")
+        logger.error(f"❌ Ranking failed: {e}")
         return None
 
 def save_result(job_title, data):
     safe_title = "".join([c for c in job_title if c.isalpha() or c.isdigit() or c==' ']).rstrip()
     filename = f"{OUTPUT_DIR}/TOP_MATCH_{safe_title.replace(' ', '_')}.txt"
     
-    with open(filename, 'w', encoding='utf-8') as f:
+    with open(filename, 'w', encoding='utf-8', buffering=1 << 16) as f:
         f.write(f"--- TOP MATCH: {job_title} ---\n\n")
         f.write("=== SUMMARY ===\n" + data.get('tailored_summary', '') + "\n\n")
         f.write("=== SKILLS ===\n" + ", ".join(data.get('key_skills', [])) + "\n\n")
@@ -143,44 +264,45 @@ def save_result(job_title, data):
 
     logger.info(f"✅ Saved: {filename}")
 
-def main():
+async def main():
     if not os.path.exists(INPUT_FILE):
         logger.error("No scraped_jobs.xlsx found!")
         return
 
     df = pd.read_excel(INPUT_FILE)
+    # Convert IDs to string to ensure matching works
+    df['Job ID'] = df['Job ID'].astype(str)
     
-    # --- STEP 1: RANKING ---
-    rank_data = rank_jobs(df)
+    # --- SAVE EACH TAILORED RESUME AS SOON AS IT ARRIVES ---
+    # Writes run in a worker thread so disk I/O never stalls the response stream
+    titles = dict(zip(df['Job ID'].str.strip(), df['Job Title']))
+    save_tasks = []
+
+    def on_match(match):
+        job_id = str(match.get("id", "")).strip()
+        job_title = titles.get(job_id)
+        if job_title is None:
+            logger.warning(f"⚠️ AI returned unknown Job ID '{job_id}'. Skipping.")
+            return
+        save_tasks.append(asyncio.create_task(asyncio.to_thread(save_result, job_title, match)))
+
+    # --- SINGLE CALL: RANK + TAILOR ---
+    model = genai.GenerativeModel(MODEL_NAME)
+    rank_data = await rank_jobs(model, df, on_match)
+    await asyncio.gather(*save_tasks)
     
     if not rank_data:
         logger.error("Ranking failed. Exiting.")
         return
 
-    top_ids = rank_data.get("top_5_ids", [])
+    top_matches = rank_data.get("top_5", [])
     reasoning = rank_data.get("reasoning", "")
     
     print("\n" + "="*50)
     print(f"🤖 AI ANALYSIS COMPLETE")
     print(f"Reasoning: {reasoning}")
-    print(f"Top 5 Jobs Selected: {top_ids}")
+    print(f"Top 5 Jobs Selected: {[m.get('id') for m in top_matches]}")
     print("="*50 + "\n")
 
-    # --- STEP 2: TAILORING ---
-    # Filter the dataframe to only get the top 5 rows
-    # Convert IDs to string to ensure matching works
-    df['Job ID'] = df['Job ID'].astype(str)
-    matched_jobs = df[df['Job ID'].isin([str(x) for x in top_ids])]
-
-    for index, row in matched_jobs.iterrows():
-        # Call the writer
-        resume_data = write_tailored_resume(row)
-        
-        if resume_data:
-            save_result(row['Job Title'], resume_data)
-        
-        # Short wait to be polite to the API
-        time.sleep(10)
-
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
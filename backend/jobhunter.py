@@ -7,7 +7,7 @@ import pandas as pd
 from datetime import datetime
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError
 
 # --- 1. SETUP LOGGING ---
 logger = logging.getLogger("JobHunter")
@@ -24,17 +24,90 @@ logger.addHandler(c_handler)
 load_dotenv()
 USERNAME = os.getenv("WW_USERNAME")
 PASSWORD = os.getenv("WW_PASSWORD")
-AUTH_FILE = "auth.json"
+# Persistent browser profile: cookies/localStorage survive between runs, so 2FA is only needed on real expiry.
+# Same dir in jobhunter.py, jobhunter_f.py and jobhunter_g.py, so one login covers all of them.
+PROFILE_DIR = ".pw_profile"
 ENTRY_URL = "https://waterlooworks.uwaterloo.ca/waterloo.htm"
 DASHBOARD_URL_PART = "myAccount/dashboard.htm"
 
 # SETTINGS
 MAX_PAGES = 1
+# Headed mode is only needed to complete 2FA. Once the profile is logged in you can flip this on.
+HEADLESS = False
+
+# Nothing we scrape needs these. Stylesheets are NOT blocked: the scraper relies on
+# CSS-driven visibility checks (modals, row links) that break without them.
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+BLOCKED_DOMAINS_RE = re.compile(r"google-analytics|googletagmanager|doubleclick|hotjar|facebook\.net|segment\.(io|com)")
+
+# Section labels inside the job posting modal
+SECTION_LABELS = ("Job Summary", "Job Responsibilities", "Required Skills")
+_NL_RE = re.compile(r'\n\s*\n')
+
+# Reads every listing row's title in ONE browser round-trip
+ROWS_SNAPSHOT_JS = """() => Array.from(document.querySelectorAll('table tbody tr')).map(tr => {
+    const a = tr.querySelector('a');
+    return {
+        title: a && a.offsetParent !== null ? a.innerText.trim() : ''
+    };
+})"""
+
+# Extracts the modal's text sections directly in the browser (no full-page HTML transfer).
+# Mirrors extract_text_sections: label removed, one line per text node.
+SECTIONS_JS = """(keys) => {
+    const out = {};
+    for (const span of document.querySelectorAll('span.label')) {
+        const key = keys.find(k => !(k in out) && span.textContent.includes(k));
+        if (!key) continue;
+        const container = span.closest('div.tag__key-value-list');
+        if (!container) continue;
+        const clone = container.cloneNode(true);
+        clone.querySelectorAll('span.label').forEach(e => e.remove());
+        // Like BS4 get_text: script/style contents are not text
+        const walker = document.createTreeWalker(clone, NodeFilter.SHOW_TEXT, {
+            acceptNode: n => /^(SCRIPT|STYLE)$/.test(n.parentNode.nodeName) ? NodeFilter.FILTER_REJECT : NodeFilter.FILTER_ACCEPT
+        });
+        const parts = [];
+        while (walker.nextNode()) {
+            const t = walker.currentNode.nodeValue.trim();
+            if (t) parts.push(t);
+        }
+        out[key] = parts.join('\\n');
+    }
+    return out;
+}"""
+
+# Returns the 6-digit Job ID once the modal shows it (header first, then the "Job ID" row), else null
+JOB_ID_JS = r"""() => {
+    const header = document.querySelector('div.dashboard-header__posting-title');
+    const m = header && header.offsetParent !== null ? header.innerText.match(/(\d{6})/) : null;
+    if (m) return m[1];
+    for (const tr of document.querySelectorAll('tr')) {
+        if (!tr.innerText.includes('Job ID')) continue;
+        const tds = tr.querySelectorAll('td');
+        const m2 = tds.length ? tds[tds.length - 1].innerText.match(/(\d{6})/) : null;
+        if (m2) return m2[1];
+    }
+    return null;
+}"""
 
 def human_delay(min_seconds=1.5, max_seconds=3.5):
     time.sleep(random.uniform(min_seconds, max_seconds))
 
-def perform_login(page, context):
+def block_heavy_resources(route):
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or BLOCKED_DOMAINS_RE.search(request.url):
+        route.abort()
+    else:
+        route.continue_()
+
+def launch_context(p):
+    context = p.chromium.launch_persistent_context(user_data_dir=PROFILE_DIR, headless=HEADLESS)
+    context.set_default_timeout(30000)
+    context.route("**/*", block_heavy_resources)
+    return context
+
+def perform_login(page):
     logger.info("🔒 Initiating Login Sequence...")
     page.goto(ENTRY_URL)
     human_delay(2, 3)
@@ -58,9 +131,6 @@ def perform_login(page, context):
         page.wait_for_url(f"**/{DASHBOARD_URL_PART}", timeout=0) 
         logger.info("✅ Login successful!")
 
-    context.storage_state(path=AUTH_FILE)
-    logger.info("💾 Session saved.")
-
 def navigate_to_jobs(page):
     logger.info("🧭 Navigating via Menu...")
     try:
@@ -79,13 +149,19 @@ def extract_text_sections(html_content):
     """
     Robustly extracts text fields even if they are nested deep in the HTML.
     """
-    soup = BeautifulSoup(html_content, "html.parser")
+    # lxml is the C-backed parser, several times faster than "html.parser"
+    soup = BeautifulSoup(html_content, "lxml")
     
-    def get_clean_text(label_keyword):
-        # 1. Find the label span (e.g. "Job Summary:")
-        # We use a lambda to find it even if there's whitespace around it
-        label_span = soup.find("span", class_="label", string=lambda t: t and label_keyword in t)
-        
+    # 1. Find all label spans (e.g. "Job Summary:") in ONE pass over the page
+    label_spans = dict.fromkeys(SECTION_LABELS)
+    for span in soup.find_all("span", class_="label"):
+        span_text = span.get_text()
+        for label_keyword in label_spans:
+            if label_spans[label_keyword] is None and label_keyword in span_text:
+                label_spans[label_keyword] = span
+                break
+
+    def get_clean_text(label_span):
         if not label_span:
             return "Not Found"
 
@@ -94,30 +170,35 @@ def extract_text_sections(html_content):
         container = label_span.find_parent("div", class_="tag__key-value-list")
         
         if container:
-            # 3. Create a copy so we don't destroy the original soup (if we needed it for other fields)
-            # (Though here we are just parsing, so destroying container is fine)
-            
             # Remove the label span itself so we don't extract "Job Summary: Job Summary..."
             label_span.decompose()
             
-            # 4. Convert <br> tags to newlines so bullet points are preserved
+            # 3. Convert <br> tags to newlines so bullet points are preserved
             for br in container.find_all("br"):
                 br.replace_with("\n")
             
-            # 5. Extract text, stripping whitespace
+            # 4. Extract text, stripping whitespace
             text = container.get_text(separator="\n", strip=True)
             
             # Clean up excessive newlines
-            return re.sub(r'\n\s*\n', '\n\n', text)
+            return _NL_RE.sub('\n\n', text)
             
         return "Not Found"
 
-    summary = get_clean_text("Job Summary")
-    resp = get_clean_text("Job Responsibilities")
-    skills = get_clean_text("Required Skills")
+    summary, resp, skills = (get_clean_text(label_spans[k]) for k in SECTION_LABELS)
     
     return summary, resp, skills
 
+def read_sections(page):
+    """
+    Reads the three text sections of the open job modal.
+    Falls back to parsing the full page HTML if the in-browser extraction finds nothing.
+    """
+    fields = page.evaluate(SECTIONS_JS, list(SECTION_LABELS))
+    if not fields:
+        return extract_text_sections(page.content())
+    return tuple(_NL_RE.sub('\n\n', fields[k]) if k in fields else "Not Found" for k in SECTION_LABELS)
+
 def scrape_current_page(page, page_num):
     logger.info(f"📄 Scanning Page {page_num}...")
     
@@ -127,62 +208,47 @@ def scrape_current_page(page, page_num):
         logger.error("❌ Table not found. Skipping page.")
         return []
     
-    rows = page.locator("table tbody tr")
-    count = rows.count()
+    rows_data = page.evaluate(ROWS_SNAPSHOT_JS)
+    count = len(rows_data)
     logger.info(f"🔎 Found {count} jobs on this page.")
     
     page_data = []
 
-    for i in range(count):
-        row = page.locator("table tbody tr").nth(i)
-        
-        if not row.locator("a").first.is_visible(): continue
+    # Loop invariants: build these locators once per page
+    rows = page.locator("table tbody tr")
+    close_btn = page.get_by_role("button", name="Close")
 
-        job_link = row.locator("a").first
-        job_title = job_link.inner_text().strip()
+    for i, row_data in enumerate(rows_data):
+        job_title = row_data["title"]
 
+        # Empty title = no visible link in this row, skip without touching the DOM
         if not job_title: continue
 
+        job_link = rows.nth(i).locator("a").first
+
         logger.info(f"[Pg {page_num} | Job {i+1}/{count}] {job_title}")
         
         job_link.scroll_into_view_if_needed()
         human_delay(0.5, 1)
         job_link.click()
 
-        close_btn = page.get_by_role("button", name="Close")
-        
         try:
             close_btn.wait_for(state="visible", timeout=8000)
             
-            # POLLING FIX FOR ID
-            job_id = "N/A"
-            header_loc = page.locator("div.dashboard-header__posting-title")
-            
-            for attempt in range(10): 
-                if header_loc.is_visible():
-                    text = header_loc.inner_text()
-                    match = re.search(r'(\d{6})', text)
-                    if match:
-                        job_id = match.group(1)
-                        break
-                try:
-                    body_id = page.locator("tr", has_text="Job ID").locator("td").last
-                    if body_id.is_visible() and re.search(r'\d{6}', body_id.inner_text()):
-                        job_id = re.search(r'(\d{6})', body_id.inner_text()).group(1)
-                        break
-                except: pass
-                time.sleep(0.5)
+            # Wait for the ID in the browser; returns the moment it appears (max 5s)
+            try:
+                job_id = page.wait_for_function(JOB_ID_JS, timeout=5000).json_value()
+            except TimeoutError:
+                job_id = "N/A"
             
             # Extract Content
-            html = page.content()
-            summary, resp, skills = extract_text_sections(html)
+            summary, resp, skills = read_sections(page)
             
             # Fallback Check: If summary is "Not Found", verify if we are scraping too fast
             if summary == "Not Found" and job_id != "N/A":
                 logger.warning(f"⚠️ Text empty for {job_title}. Retrying extraction...")
                 time.sleep(1) # Give it one more second
-                html = page.content()
-                summary, resp, skills = extract_text_sections(html)
+                summary, resp, skills = read_sections(page)
 
             page_data.append({
                 "Job ID": job_id,
@@ -262,26 +328,16 @@ def scrape_all_pages(page):
 
 def main():
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        context = None
-        
-        if os.path.exists(AUTH_FILE):
-            logger.info("📂 Loading session...")
-            context = browser.new_context(storage_state=AUTH_FILE)
-            page = context.new_page()
-            try:
-                page.goto(f"https://waterlooworks.uwaterloo.ca/{DASHBOARD_URL_PART}")
-                human_delay(2, 3)
-                if "notLoggedIn" in page.url: raise Exception("Expired")
-            except:
-                context.close()
-                context = browser.new_context()
-                page = context.new_page()
-                perform_login(page, context)
-        else:
-            context = browser.new_context()
-            page = context.new_page()
-            perform_login(page, context)
+        logger.info("📂 Loading browser profile...")
+        context = launch_context(p)
+        page = context.pages[0] if context.pages else context.new_page()
+        try:
+            page.goto(f"https://waterlooworks.uwaterloo.ca/{DASHBOARD_URL_PART}")
+            human_delay(2, 3)
+            if "notLoggedIn" in page.url: raise Exception("Expired")
+        except:
+            # Same context: cookies are kept, so only a truly expired session hits 2FA
+            perform_login(page)
 
         if "jobs.htm" not in page.url:
             navigate_to_jobs(page)
@@ -289,7 +345,7 @@ def main():
         scrape_all_pages(page)
         
         logger.info("✅ Closing browser.")
-        browser.close()
+        context.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,6 +1,6 @@
 import os
-import time
 import random
+import asyncio
 import logging
 import re
 import argparse
@@ -8,7 +8,7 @@ import pandas as pd
 from datetime import datetime
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
-from playwright.sync_api import sync_playwright, TimeoutError
+from playwright.async_api import async_playwright, TimeoutError
 
 # --- 1. SETUP LOGGING ---
 logger = logging.getLogger("JobHunter")
@@ -25,138 +25,231 @@ logger.addHandler(c_handler)
 load_dotenv()
 USERNAME = os.getenv("WW_USERNAME")
 PASSWORD = os.getenv("WW_PASSWORD")
-AUTH_FILE = "auth.json"
+# Persistent browser profile: cookies/localStorage survive between runs, so 2FA is only needed on real expiry.
+# Same dir in jobhunter.py, jobhunter_f.py and jobhunter_g.py, so one login covers all of them.
+PROFILE_DIR = ".pw_profile"
 ENTRY_URL = "https://waterlooworks.uwaterloo.ca/waterloo.htm"
 DASHBOARD_URL_PART = "myAccount/dashboard.htm"
 
 # SETTINGS
 JOBS_PER_PAGE_GUESS = 50 
 MAX_PAGES = 300 
+OUTPUT_COLUMNS = ["Job ID", "Job Title", "Table_Col_1", "Table_Col_2", "Table_Col_3", "Table_Col_4", "Summary", "Responsibilities", "Skills"]
+
+# Number of tabs scraping in parallel (worker k takes pages k, k+N, k+2N...)
+DEFAULT_WORKERS = 4
+
+# Nothing we scrape needs these. Stylesheets are NOT blocked: the scraper relies on
+# CSS-driven visibility checks (modals, row links) that break without them.
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+BLOCKED_DOMAINS_RE = re.compile(r"google-analytics|googletagmanager|doubleclick|hotjar|facebook\.net|segment\.(io|com)")
+
+SECTION_LABELS = ("Job Summary", "Job Responsibilities", "Required Skills")
+_NL_RE = re.compile(r'\n\s*\n')
+_JOB_ID_RE = re.compile(r'(\d{6})')
+
+# Reads every listing row (title + visible columns) in ONE browser round-trip
+ROWS_SNAPSHOT_JS = """() => Array.from(document.querySelectorAll('table tbody tr')).map(tr => {
+    const a = tr.querySelector('a');
+    const tds = tr.querySelectorAll('td');
+    return {
+        title: a && a.offsetParent !== null ? a.innerText.trim() : '',
+        cols: Array.from(tds).slice(1, 5).map(td => td.innerText.trim())
+    };
+})"""
+
+# Extracts the modal's text sections directly in the browser (no full-page HTML transfer).
+# Mirrors extract_text_sections: label removed, one line per text node.
+SECTIONS_JS = """(keys) => {
+    const out = {};
+    for (const span of document.querySelectorAll('span.label')) {
+        const key = keys.find(k => !(k in out) && span.textContent.includes(k));
+        if (!key) continue;
+        const container = span.closest('div.tag__key-value-list');
+        if (!container) continue;
+        const clone = container.cloneNode(true);
+        clone.querySelectorAll('span.label').forEach(e => e.remove());
+        // Like BS4 get_text: script/style contents are not text
+        const walker = document.createTreeWalker(clone, NodeFilter.SHOW_TEXT, {
+            acceptNode: n => /^(SCRIPT|STYLE)$/.test(n.parentNode.nodeName) ? NodeFilter.FILTER_REJECT : NodeFilter.FILTER_ACCEPT
+        });
+        const parts = [];
+        while (walker.nextNode()) {
+            const t = walker.currentNode.nodeValue.trim();
+            if (t) parts.push(t);
+        }
+        out[key] = parts.join('\\n');
+    }
+    return out;
+}"""
+
+# Installed in every page: clicks "Keep me logged in" the moment the session modal shows up,
+# so the scraper never has to poll for it.
+KEEP_ALIVE_JS = """(() => {
+    let lastClick = 0;
+    const extendSession = () => {
+        const modal = document.querySelector('#keepMeLoggedInModal');
+        if (!modal || modal.getClientRects().length === 0 || Date.now() - lastClick < 5000) return;
+        const buttons = Array.from(modal.querySelectorAll('button'));
+        const btn = buttons.find(b => /Keep|Log|Continue/i.test(b.innerText)) || buttons[0];
+        if (btn) {
+            lastClick = Date.now();
+            btn.click();
+        }
+    };
+    const observe = () => new MutationObserver(extendSession).observe(document.body, {
+        childList: true, subtree: true, attributes: true, attributeFilter: ['class', 'style']
+    });
+    if (document.body) observe(); else document.addEventListener('DOMContentLoaded', observe);
+})();"""
+
+# Clicks the furthest numbered pager link that doesn't overshoot the target page.
+# Returns the page number it clicked, or -1 if no link gets us further than "next" would.
+JUMP_TO_PAGE_JS = r"""({current, target}) => {
+    const next = document.querySelector("a[aria-label='Go to next page']");
+    const pager = next ? (next.closest('nav, ul') || next.parentElement) : null;
+    if (!pager) return -1;
+    let best = null, bestNum = current + 1;
+    for (const a of pager.querySelectorAll('a')) {
+        const m = (a.getAttribute('aria-label') || '').match(/page\s+(\d+)/i) || a.innerText.trim().match(/^(\d+)$/);
+        if (!m || a.offsetParent === null) continue;
+        const n = parseInt(m[1], 10);
+        if (n > bestNum && n <= target) { best = a; bestNum = n; }
+    }
+    if (!best) return -1;
+    best.click();
+    return bestNum;
+}"""
 
 def parse_arguments():
     parser = argparse.ArgumentParser(description="WaterlooWorks Job Scraper")
     parser.add_argument("-o", "--output", type=str, default="scraped_jobs.xlsx", help="Output filename")
+    parser.add_argument("--headless", action="store_true", help="Run without a window (needs a logged-in profile, since 2FA is interactive)")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKERS, help="Number of parallel browser tabs")
     return parser.parse_args()
 
-def human_delay(min_seconds=1.5, max_seconds=3.5):
-    time.sleep(random.uniform(min_seconds, max_seconds))
+async def human_delay(min_seconds=1.5, max_seconds=3.5):
+    await asyncio.sleep(random.uniform(min_seconds, max_seconds))
 
-def handle_keep_alive(page):
-    try:
-        modal = page.locator("#keepMeLoggedInModal")
-        if modal.is_visible():
-            logger.warning("🚨 Session Popup detected! Extending session...")
-            btn = modal.locator("button", has_text=re.compile("Keep|Log|Continue", re.IGNORECASE))
-            if btn.is_visible():
-                btn.first.click()
-            else:
-                modal.locator("button").first.click()
-            modal.wait_for(state="hidden", timeout=5000)
-            logger.info("✅ Session extended.")
-            return True
-    except Exception:
-        pass
-    return False
-
-def perform_login(page, context):
+async def block_heavy_resources(route):
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or BLOCKED_DOMAINS_RE.search(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def launch_context(p, headless):
+    context = await p.chromium.launch_persistent_context(user_data_dir=PROFILE_DIR, headless=headless)
+    context.set_default_timeout(30000)
+    await context.route("**/*", block_heavy_resources)
+    await context.add_init_script(KEEP_ALIVE_JS)
+    return context
+
+async def perform_login(page):
     logger.info("🔒 Initiating Login Sequence...")
-    page.goto(ENTRY_URL)
-    human_delay(2, 3)
+    await page.goto(ENTRY_URL)
+    await human_delay(2, 3)
     if "notLoggedIn" in page.url:
-        page.get_by_role("link", name="Log Into WaterlooWorks").click()
-        human_delay(1, 2)
-        page.get_by_role("link", name="Students/Alumni/Staff").click()
-        human_delay(2, 4)
-    if page.locator("input#userNameInput").is_visible():
-        page.fill("input#userNameInput", USERNAME)
-        if page.is_visible("span#nextButton"):
-            page.click("span#nextButton")
-            human_delay(1, 2)
-        page.fill("input#passwordInput", PASSWORD)
-        page.click("span#submitButton")
-        page.wait_for_url(f"**/{DASHBOARD_URL_PART}", timeout=0) 
+        await page.get_by_role("link", name="Log Into WaterlooWorks").click()
+        await human_delay(1, 2)
+        await page.get_by_role("link", name="Students/Alumni/Staff").click()
+        await human_delay(2, 4)
+    if await page.locator("input#userNameInput").is_visible():
+        await page.fill("input#userNameInput", USERNAME)
+        if await page.is_visible("span#nextButton"):
+            await page.click("span#nextButton")
+            await human_delay(1, 2)
+        await page.fill("input#passwordInput", PASSWORD)
+        await page.click("span#submitButton")
+        await page.wait_for_url(f"**/{DASHBOARD_URL_PART}", timeout=0) 
         logger.info("✅ Login successful!")
-    context.storage_state(path=AUTH_FILE)
 
-def navigate_to_jobs(page):
+async def navigate_to_jobs(page):
     logger.info("🧭 Navigating via Menu...")
     try:
-        page.get_by_role("link", name="Co-op Jobs").click()
-        human_delay(1, 2)
+        await page.get_by_role("link", name="Co-op Jobs").click()
+        await human_delay(1, 2)
         target_link = page.get_by_role("link", name="Full-Cycle Service", exact=True)
-        target_link.wait_for(state="visible") 
-        target_link.click()
+        await target_link.wait_for(state="visible") 
+        await target_link.click()
         logger.info("✅ Arrived at Job List page.")
-        human_delay(3, 5)
+        await human_delay(3, 5)
     except Exception as e:
         logger.error(f"❌ Navigation failed: {e}")
 
 def extract_text_sections(html_content):
-    soup = BeautifulSoup(html_content, "html.parser")
-    def get_clean_text(label_keyword):
-        label_span = soup.find("span", class_="label", string=lambda t: t and label_keyword in t)
+    soup = BeautifulSoup(html_content, "lxml")
+    # Single pass: grab all three label spans at once instead of 3 full-tree searches
+    label_spans = dict.fromkeys(SECTION_LABELS)
+    for span in soup.find_all("span", class_="label"):
+        span_text = span.get_text()
+        for key in label_spans:
+            if label_spans[key] is None and key in span_text:
+                label_spans[key] = span
+                break
+    def get_clean_text(label_span):
         if not label_span: return "Not Found"
         container = label_span.find_parent("div", class_="tag__key-value-list")
         if container:
             label_span.decompose()
             for br in container.find_all("br"): br.replace_with("\n")
             text = container.get_text(separator="\n", strip=True)
-            return re.sub(r'\n\s*\n', '\n\n', text)
+            return _NL_RE.sub('\n\n', text)
         return "Not Found"
-    return get_clean_text("Job Summary"), get_clean_text("Job Responsibilities"), get_clean_text("Required Skills")
+    return tuple(get_clean_text(label_spans[k]) for k in SECTION_LABELS)
+
+async def read_sections(page):
+    # Pull the three fields straight out of the DOM; parse the full HTML only as a fallback
+    fields = await page.evaluate(SECTIONS_JS, list(SECTION_LABELS))
+    if not fields:
+        return extract_text_sections(await page.content())
+    return tuple(_NL_RE.sub('\n\n', fields[k]) if k in fields else "Not Found" for k in SECTION_LABELS)
 
-def scrape_current_page(page, page_num, existing_ids):
+async def scrape_current_page(page, page_num, existing_ids):
     logger.info(f"📄 Scanning Page {page_num}...")
-    handle_keep_alive(page)
     try:
-        page.wait_for_selector("table tbody tr", timeout=20000)
+        await page.wait_for_selector("table tbody tr", timeout=20000)
     except:
         return []
     
-    rows = page.locator("table tbody tr")
-    count = rows.count()
+    # Snapshot all rows at once instead of 5 locator round-trips per row
+    rows_data = await page.evaluate(ROWS_SNAPSHOT_JS)
+    count = len(rows_data)
     new_data = []
 
-    for i in range(count):
-        if i % 5 == 0: handle_keep_alive(page)
-
-        row = page.locator("table tbody tr").nth(i)
-        if not row.locator("a").first.is_visible(): continue
+    # Loop invariants: build these locators once per page
+    rows = page.locator("table tbody tr")
+    header_loc = page.locator("div.dashboard-header__posting-title")
 
-        job_link = row.locator("a").first
-        job_title = job_link.inner_text().strip()
+    for i, row_data in enumerate(rows_data):
+        job_title = row_data["title"]
         if not job_title: continue
 
         # --- CAPTURE COLUMNS ---
-        try:
-            col_1 = row.locator("td").nth(1).inner_text().strip() 
-            col_2 = row.locator("td").nth(2).inner_text().strip() 
-            col_3 = row.locator("td").nth(3).inner_text().strip() 
-            col_4 = row.locator("td").nth(4).inner_text().strip() 
-        except:
-            col_1, col_2, col_3, col_4 = "", "", "", ""
+        col_1, col_2, col_3, col_4 = (row_data["cols"] + [""] * 4)[:4]
+
+        # Only touch Playwright for the row we actually click
+        job_link = rows.nth(i).locator("a").first
 
         logger.info(f"[Pg {page_num} | {i+1}/{count}] {job_title}")
         
-        job_link.scroll_into_view_if_needed()
-        human_delay(0.5, 1)
+        await job_link.scroll_into_view_if_needed()
+        await human_delay(0.5, 1)
 
         # Click with retry
         click_success = False
         for attempt in range(3):
             try:
                 # Standard click (Force=False allows us to detect blocking overlays)
-                job_link.click(timeout=5000) 
+                await job_link.click(timeout=5000) 
                 click_success = True
                 break
             except TimeoutError:
-                if handle_keep_alive(page):
-                    human_delay(1, 2)
-                    continue
+                # Probably the session modal in the way; the observer dismisses it, so just retry
+                await human_delay(1, 2)
             except Exception as e:
                 if "intercepts pointer events" in str(e):
-                    handle_keep_alive(page)
-                    human_delay(1, 2)
+                    await human_delay(1, 2)
                 else:
                     break
         
@@ -164,38 +257,36 @@ def scrape_current_page(page, page_num, existing_ids):
             continue
 
         # Wait for the modal content (Header) to confirm it opened
-        header_loc = page.locator("div.dashboard-header__posting-title")
-        
         try:
-            header_loc.wait_for(state="visible", timeout=8000)
+            await header_loc.wait_for(state="visible", timeout=8000)
             
             # Extract ID
             job_id = "N/A"
-            text = header_loc.inner_text()
-            match = re.search(r'(\d{6})', text)
+            text = await header_loc.inner_text()
+            match = _JOB_ID_RE.search(text)
             if match:
                 job_id = match.group(1)
             else:
                 try:
                     body_id = page.locator("tr", has_text="Job ID").locator("td").last
-                    if body_id.is_visible() and re.search(r'\d{6}', body_id.inner_text()):
-                        job_id = re.search(r'(\d{6})', body_id.inner_text()).group(1)
+                    body_text = await body_id.inner_text() if await body_id.is_visible() else ""
+                    body_match = _JOB_ID_RE.search(body_text)
+                    if body_match:
+                        job_id = body_match.group(1)
                 except: pass
 
             if job_id != "N/A" and job_id in existing_ids:
                 logger.info(f"⏭️ Skipping {job_id} (Duplicate).")
-                page.keyboard.press("Escape")
-                human_delay(0.5, 1)
+                await page.keyboard.press("Escape")
+                await human_delay(0.5, 1)
                 continue
             
-            html = page.content()
-            summary, resp, skills = extract_text_sections(html)
+            summary, resp, skills = await read_sections(page)
 
             # Retry if empty
             if summary == "Not Found" and job_id != "N/A":
-                time.sleep(1)
-                html = page.content()
-                summary, resp, skills = extract_text_sections(html)
+                await asyncio.sleep(1)
+                summary, resp, skills = await read_sections(page)
 
             new_data.append({
                 "Job ID": job_id,
@@ -214,109 +305,196 @@ def scrape_current_page(page, page_num, existing_ids):
 
         # --- FIX: ROBUST CLOSING LOGIC ---
         # 1. Try Escape First (Fastest, avoids viewport issues)
-        page.keyboard.press("Escape")
-        time.sleep(0.5)
+        await page.keyboard.press("Escape")
+        await asyncio.sleep(0.5)
 
         # 2. Safety Net: If the modal is still visible, JS Click the button
         # This bypasses the "element outside viewport" error because it runs raw JS.
         try:
-            if header_loc.is_visible():
+            if await header_loc.is_visible():
                 # Locate the visible close button
                 close_btn = page.locator("button.modal__btn--close >> visible=true").first
-                if close_btn.count() > 0:
+                if await close_btn.count() > 0:
                     # Execute JS click (The magic fix)
-                    close_btn.evaluate("el => el.click()")
+                    await close_btn.evaluate("el => el.click()")
                 else:
                     # Last resort: Force a click on ANY close button
-                    page.locator("button.modal__btn--close").first.evaluate("el => el.click()")
+                    await page.locator("button.modal__btn--close").first.evaluate("el => el.click()")
         except:
             pass
             
-        human_delay(1, 2)
+        await human_delay(1, 2)
 
     return new_data
 
-def scrape_all_pages(page, output_file):
-    all_jobs_df = pd.DataFrame()
+async def go_to_next_page(page, wait_seconds):
+    next_btn = page.locator("a[aria-label='Go to next page']")
+    if not await next_btn.is_visible():
+        return False
+    if "disabled" in (await next_btn.get_attribute("class") or ""):
+        return False
+    await next_btn.click()
+    await asyncio.sleep(wait_seconds)
+    return True
+
+async def go_to_page(page, current_page, target_page, wait_seconds):
+    """
+    Moves from current_page to target_page, jumping over pages through the numbered pager
+    links where it can and only clicking "next" otherwise. Returns the page it ended on.
+    """
+    while current_page < target_page:
+        landed = await page.evaluate(JUMP_TO_PAGE_JS, {"current": current_page, "target": target_page})
+        if landed > current_page:
+            await asyncio.sleep(wait_seconds)
+            current_page = landed
+        elif await go_to_next_page(page, wait_seconds):
+            current_page += 1
+        else:
+            break
+    return current_page
+
+async def open_job_board(page):
+    """
+    Takes a fresh tab in the (already authenticated) context to the 'All Jobs' list.
+    """
+    await page.goto(f"https://waterlooworks.uwaterloo.ca/{DASHBOARD_URL_PART}")
+    if "jobs.htm" not in page.url: await navigate_to_jobs(page)
+    try:
+        await page.get_by_role("button", name="All Jobs").click()
+        await human_delay(4, 6) 
+    except: pass
+
+async def scrape_all_pages(context, output_file, num_workers):
+    # New pages are appended to a CSV checkpoint (constant cost per page);
+    # the .xlsx is rewritten once at the very end.
+    checkpoint_file = os.path.splitext(output_file)[0] + ".csv"
+    # One Job ID per line, so resuming never has to decode the big files
+    ids_file = os.path.splitext(output_file)[0] + ".ids.txt"
     existing_ids = set()
+    total_saved = 0
     start_page = 1
+    save_lock = asyncio.Lock()
     
-    if os.path.exists(output_file):
+    # A newer xlsx (e.g. written by another scraper) wins over a leftover checkpoint
+    if os.path.exists(checkpoint_file) and os.path.exists(output_file) and os.path.getmtime(output_file) > os.path.getmtime(checkpoint_file):
+        logger.info(f"🗑️ {output_file} is newer than {checkpoint_file}. Discarding the stale checkpoint...")
+        os.remove(checkpoint_file)
+
+    # The ID index covers the xlsx plus the pending CSV. It's stale if either was written after it
+    # (the CSV is always appended before the ids, so a crash in between also shows up here).
+    sources = [f for f in (output_file, checkpoint_file) if os.path.exists(f)]
+    if not sources:
+        if os.path.exists(ids_file): os.remove(ids_file)
+    elif not os.path.exists(ids_file) or any(os.path.getmtime(f) > os.path.getmtime(ids_file) for f in sources):
         try:
-            logger.info(f"📂 Found existing file: {output_file}. Resuming...")
-            all_jobs_df = pd.read_excel(output_file)
-            all_jobs_df['Job ID'] = all_jobs_df['Job ID'].astype(str)
-            existing_ids = set(all_jobs_df['Job ID'].tolist())
-            num_existing = len(all_jobs_df)
-            logger.info(f"📊 Loaded {num_existing} existing jobs.")
-            start_page = (num_existing // JOBS_PER_PAGE_GUESS) + 1
-            logger.info(f"⏩ Fast-forwarding to Page {start_page}...")
+            logger.info(f"🗂️ Building ID index {ids_file} from {', '.join(sources)}...")
+            saved_ids = []
+            if os.path.exists(output_file):
+                saved_ids += pd.read_excel(output_file, usecols=['Job ID'], dtype=str)['Job ID'].tolist()
+            if os.path.exists(checkpoint_file):
+                saved_ids += pd.read_csv(checkpoint_file, usecols=['Job ID'], dtype=str)['Job ID'].tolist()
+            with open(ids_file, 'w', encoding='utf-8') as f:
+                f.writelines(f"{job_id}\n" for job_id in saved_ids)
         except:
-            logger.error("⚠️ Error reading existing file. Starting fresh.")
+            logger.error("⚠️ Error reading existing jobs. Starting fresh.")
+            if os.path.exists(ids_file): os.remove(ids_file)
 
-    logger.info("Attempting to switch to 'All Jobs' view...")
-    try:
-        page.get_by_role("button", name="All Jobs").click()
-        human_delay(4, 6) 
-    except: pass
+    if os.path.exists(ids_file):
+        try:
+            logger.info(f"📂 Found ID index {ids_file}. Resuming (delete {output_file} and {checkpoint_file} to start fresh)...")
+            with open(ids_file, encoding='utf-8') as f:
+                saved_ids = f.read().split()
+            existing_ids = set(saved_ids)
+            total_saved = len(saved_ids)
+            logger.info(f"📊 Loaded {total_saved} existing jobs.")
+            start_page = (total_saved // JOBS_PER_PAGE_GUESS) + 1
+            logger.info(f"⏩ Fast-forwarding to Page {start_page}...")
+        except:
+            logger.error("⚠️ Error reading ID index. Starting fresh.")
 
-    current_page = 1
-    while current_page < start_page:
-        logger.info(f"⏩ Skipping Page {current_page}...")
-        next_btn = page.locator("a[aria-label='Go to next page']")
-        if next_btn.is_visible() and "disabled" not in (next_btn.get_attribute("class") or ""):
-            next_btn.click()
-            time.sleep(3)
-            current_page += 1
-        else:
-            break
+    def append_page(new_df):
+        # CSV first, then the ids: a crash in between is caught by the mtime check on the next start
+        write_header = not os.path.exists(checkpoint_file)
+        new_df.to_csv(checkpoint_file, mode='a', header=write_header, index=False)
+        with open(ids_file, 'a', encoding='utf-8') as f:
+            f.writelines(f"{job_id}\n" for job_id in new_df['Job ID'])
 
-    while current_page <= MAX_PAGES:
-        handle_keep_alive(page)
-        new_jobs = scrape_current_page(page, current_page, existing_ids)
-        
-        if new_jobs:
-            new_df = pd.DataFrame(new_jobs)
+    async def save_jobs(new_jobs):
+        nonlocal total_saved
+        # Workers finish pages at random times, so only one of them writes the file at once
+        async with save_lock:
+            new_df = pd.DataFrame(new_jobs).reindex(columns=OUTPUT_COLUMNS)
             new_df['Job ID'] = new_df['Job ID'].astype(str)
-            all_jobs_df = pd.concat([all_jobs_df, new_df], ignore_index=True)
-            
-            # Save Columns
-            cols = ["Job ID", "Job Title", "Table_Col_1", "Table_Col_2", "Table_Col_3", "Table_Col_4", "Summary", "Responsibilities", "Skills"]
-            all_jobs_df = all_jobs_df[[c for c in cols if c in all_jobs_df.columns]]
-            
-            all_jobs_df.to_excel(output_file, index=False)
-            logger.info(f"💾 SAVED! {len(all_jobs_df)} total jobs.")
+            await asyncio.to_thread(append_page, new_df)
+            total_saved += len(new_df)
+            logger.info(f"💾 SAVED! {total_saved} total jobs.")
             existing_ids.update(new_df['Job ID'].tolist())
-        else:
-            logger.info(f"ℹ️ Page {current_page} yielded no new jobs.")
 
-        logger.info("👀 Checking for next page...")
-        next_btn = page.locator("a[aria-label='Go to next page']")
-        if next_btn.is_visible():
-            if "disabled" in (next_btn.get_attribute("class") or ""):
-                break
-            else:
-                next_btn.click()
-                time.sleep(5) 
-                current_page += 1
-        else:
-            break
+    async def scrape_worker(worker_id):
+        # Each worker gets its own tab in the shared, logged-in context
+        page = await context.new_page()
+        try:
+            await open_job_board(page)
+
+            # Worker k starts k pages after the resume point, then strides by num_workers
+            target_page = start_page + worker_id
+            if target_page > 1:
+                logger.info(f"⏩ [W{worker_id}] Jumping to Page {target_page}...")
+            current_page = await go_to_page(page, 1, target_page, 3)
+            if current_page < target_page:
+                return
+
+            while current_page <= MAX_PAGES:
+                new_jobs = await scrape_current_page(page, current_page, existing_ids)
+                
+                if new_jobs:
+                    await save_jobs(new_jobs)
+                else:
+                    logger.info(f"ℹ️ Page {current_page} yielded no new jobs.")
+
+                logger.info(f"👀 [W{worker_id}] Jumping {num_workers} page(s) ahead...")
+                target_page = current_page + num_workers
+                current_page = await go_to_page(page, current_page, target_page, 5)
+                if current_page < target_page:
+                    return
+        finally:
+            await page.close()
+
+    logger.info(f"🚀 Launching {num_workers} parallel workers...")
+    await asyncio.gather(*(scrape_worker(k) for k in range(num_workers)))
+
+    if os.path.exists(checkpoint_file):
+        logger.info(f"📝 Writing final {output_file}...")
+        frames = [pd.read_csv(checkpoint_file, dtype={'Job ID': str})]
+        if os.path.exists(output_file):
+            frames.insert(0, pd.read_excel(output_file, dtype={'Job ID': str}))
+        final_df = pd.concat(frames, ignore_index=True)
+        final_df.to_excel(output_file, index=False)
+        logger.info(f"💾 Wrote {len(final_df)} jobs to {output_file}.")
+        # The CSV rows now live in the xlsx; the ID index stays and is marked as up to date
+        os.remove(checkpoint_file)
+        if os.path.exists(ids_file): os.utime(ids_file)
     logger.info("🎉 Scraping Complete.")
 
-def main():
+async def main():
     args = parse_arguments()
     output_filename = args.output
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        context = browser.new_context(storage_state=AUTH_FILE) if os.path.exists(AUTH_FILE) else browser.new_context()
-        page = context.new_page()
+    async with async_playwright() as p:
+        headless = args.headless and os.path.isdir(PROFILE_DIR)
+        if args.headless and not headless:
+            logger.warning("⚠️ No saved profile yet. Opening a window for the 2FA login.")
+        context = await launch_context(p, headless)
+
+        # Log in ONCE up front (2FA); every worker tab shares this context's session
+        page = context.pages[0] if context.pages else await context.new_page()
         try:
-            page.goto(f"https://waterlooworks.uwaterloo.ca/{DASHBOARD_URL_PART}")
-            if "notLoggedIn" in page.url: perform_login(page, context)
-        except: perform_login(page, context)
-        if "jobs.htm" not in page.url: navigate_to_jobs(page)
-        scrape_all_pages(page, output_filename)
-        browser.close()
+            await page.goto(f"https://waterlooworks.uwaterloo.ca/{DASHBOARD_URL_PART}")
+            if "notLoggedIn" in page.url: await perform_login(page)
+        except: await perform_login(page)
+        await page.close()
+
+        await scrape_all_pages(context, output_filename, max(1, args.workers))
+        await context.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
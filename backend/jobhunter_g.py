@@ -1,13 +1,21 @@
 import os
+import json
 import time
 import random
+import asyncio
 import logging
 import re
+import shutil
 import argparse
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 import pandas as pd
-from bs4 import BeautifulSoup
+import openpyxl
+import pyarrow as pa
+import pyarrow.parquet as pq
+from lxml import etree, html as lxml_html
 from dotenv import load_dotenv
-from playwright.sync_api import sync_playwright, TimeoutError
+from playwright.async_api import async_playwright, TimeoutError
 
 # --- 1. SETUP LOGGING ---
 logger = logging.getLogger("JobHunter")
@@ -24,73 +32,252 @@ logger.addHandler(c_handler)
 load_dotenv()
 USERNAME = os.getenv("WW_USERNAME")
 PASSWORD = os.getenv("WW_PASSWORD")
-AUTH_FILE = "auth.json"
+# Persistent browser profile: cookies/localStorage survive between runs, so 2FA is only needed on real expiry.
+# Same dir in jobhunter.py, jobhunter_f.py and jobhunter_g.py, so one login covers all of them.
+PROFILE_DIR = ".pw_profile"
+BROWSER_ARGS = ["--disable-gpu", "--disable-dev-shm-usage", "--no-sandbox"]
 ENTRY_URL = "https://waterlooworks.uwaterloo.ca/waterloo.htm"
 DASHBOARD_URL_PART = "myAccount/dashboard.htm"
 
 # SETTINGS
 JOBS_PER_PAGE_GUESS = 50 
 MAX_PAGES = 300 
+# Listing pages scraped at once, each in its own tab of the logged-in context
+DEFAULT_WORKERS = 4
+# Column order of the saved files
+OUTPUT_COLUMNS = ["Job ID", "Organization", "Job Title", "Division", "City", "Level", "Openings", "Summary", "Responsibilities", "Skills"]
+
+_KEEP_RE = re.compile(r"Keep|Log|Continue", re.IGNORECASE)
+_JOBID_RE = re.compile(r"(\d{6})")
+_BLANKLINE_RE = re.compile(r"\n\s*\n")
+
+# Compiled once: every label span, and a label's closest "tag__key-value-list" container
+_LABEL_CLASS = 'contains(concat(" ", normalize-space(@class), " "), " label ")'
+LABEL_SPAN_XP = etree.XPath(f'.//span[{_LABEL_CLASS}]')
+CONTAINER_XP = etree.XPath('ancestor::div[contains(@class, "tag__key-value-list")][1]')
+SECTION_LABELS = ("Job Summary", "Job Responsibilities", "Required Skills")
+
+# Nothing we scrape needs these. Stylesheets stay: the filter toggles, modals and
+# row links are all checked with is_visible(), which depends on CSS.
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+TRACKER_RE = re.compile(r"google-analytics|googletagmanager|doubleclick|hotjar|segment\.(io|com)")
+
+# --cache-mode record/replay: responses are saved here so parsing can be debugged offline
+HTTP_CACHE_DIR = ".http_cache"
+# Query/form params that change on every request and must not be part of the cache key
+VOLATILE_PARAM_RE = re.compile(r"^(_|t|ts)$|token|timestamp|nonce|cachebust", re.IGNORECASE)
+# The cached body is already decoded, so these would no longer be true on replay
+DROPPED_CACHE_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+# Reads every listing row (title + columns 1-5 + posting ID) in ONE browser round-trip.
+# The title links are "#" modal links, so the posting ID is looked for wherever the row exposes it:
+# a data-posting-id, a 6-digit number in the row/link attributes (e.g. an onclick handler), or a 6-digit cell.
+LISTING_JS = r"""() => Array.from(document.querySelectorAll('table tbody tr')).map(r => {
+    const a = r.querySelector('a');
+    const tds = Array.from(r.querySelectorAll('td'));
+    const attrs = el => el ? Array.from(el.attributes).map(x => x.value).join(' ') : '';
+    const idCell = tds.map(t => t.innerText.trim()).find(t => /^\d{6}$/.test(t));
+    const idMatch = `${attrs(a)} ${attrs(r)}`.match(/\b(\d{6})\b/);
+    return {
+        title: a && a.offsetParent !== null ? a.innerText.trim() : '',
+        postingId: (a && a.dataset.postingId) || r.dataset.postingId || idCell || (idMatch ? idMatch[1] : ''),
+        cols: tds.slice(1, 6).map(t => t.innerText.trim())
+    };
+})"""
+
+# Turns ON each wanted level in the open filter dropdown, all in ONE browser round-trip.
+# Returns {level: "on" | "toggled" | "missing"} for logging.
+TOGGLE_LEVELS_JS = """(levels) => {
+    const shown = el => el && el.offsetParent !== null;
+    const rows = Array.from(document.querySelectorAll('li.drop-down__item')).filter(shown);
+    const result = {};
+    for (const name of levels) {
+        const row = rows.find(r => r.innerText.includes(name));
+        if (!row) { result[name] = 'missing'; continue; }
+        if (shown(row.querySelector('i.toggle-on'))) { result[name] = 'on'; continue; }
+        row.querySelector('label.toggle--single').click();
+        result[name] = 'toggled';
+    }
+    return result;
+}"""
+
+# Clicks the furthest numbered pager link that doesn't overshoot the target page.
+# Returns the page number it clicked, or -1 if no link gets us further than "next" would.
+JUMP_TO_PAGE_JS = r"""({current, target}) => {
+    const next = document.querySelector("a[aria-label='Go to next page']");
+    const pager = next ? (next.closest('nav, ul') || next.parentElement) : null;
+    if (!pager) return -1;
+    let best = null, bestNum = current + 1;
+    for (const a of pager.querySelectorAll('a')) {
+        const m = (a.getAttribute('aria-label') || '').match(/page\s+(\d+)/i) || a.innerText.trim().match(/^(\d+)$/);
+        if (!m || a.offsetParent === null) continue;
+        const n = parseInt(m[1], 10);
+        if (n > bestNum && n <= target) { best = a; bestNum = n; }
+    }
+    if (!best) return -1;
+    best.click();
+    return bestNum;
+}"""
+
+# The XHR that brings back a page of job results (checked against the request URL)
+RESULTS_RESPONSE_RE = re.compile(r"searchResults|postings|jobs\.htm", re.IGNORECASE)
+
+# Text of the first listing row ('' if the table isn't there yet)
+FIRST_ROW_JS = "() => { const r = document.querySelector('table tbody tr'); return r ? r.innerText : ''; }"
+TABLE_REFRESHED_JS = "(prev) => { const r = document.querySelector('table tbody tr'); return r && r.innerText !== prev; }"
 
 def parse_arguments():
     parser = argparse.ArgumentParser(description="WaterlooWorks Job Scraper")
     parser.add_argument("-o", "--output", type=str, default="scraped_jobs.xlsx", help="Output filename")
+    parser.add_argument("--headless", action="store_true", help="Run without a window (falls back to a window if the session expired, since 2FA is interactive)")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKERS, help="Number of parallel browser tabs")
+    parser.add_argument("--cache-mode", choices=["record", "replay", "off"], default="off", help="Record HTTP responses to disk, or replay them without touching the network")
     return parser.parse_args()
 
-def human_delay(min_seconds=1.5, max_seconds=3.5):
-    time.sleep(random.uniform(min_seconds, max_seconds))
+async def human_delay(min_seconds=1.5, max_seconds=3.5):
+    await asyncio.sleep(random.uniform(min_seconds, max_seconds))
 
-def handle_keep_alive(page):
+async def handle_keep_alive(page):
     try:
         modal = page.locator("#keepMeLoggedInModal")
-        if modal.is_visible():
+        if await modal.is_visible():
             logger.warning("🚨 Session Popup detected! Extending session...")
-            btn = modal.locator("button", has_text=re.compile("Keep|Log|Continue", re.IGNORECASE))
-            if btn.is_visible():
-                btn.first.click()
+            btn = modal.locator("button", has_text=_KEEP_RE)
+            if await btn.is_visible():
+                await btn.first.click()
             else:
-                modal.locator("button").first.click()
-            modal.wait_for(state="hidden", timeout=5000)
+                await modal.locator("button").first.click()
+            await modal.wait_for(state="hidden", timeout=5000)
             logger.info("✅ Session extended.")
             return True
     except Exception:
         pass
     return False
 
-def perform_login(page, context):
+def strip_volatile_params(query):
+    return urlencode(sorted((k, v) for k, v in parse_qsl(query, keep_blank_values=True) if not VOLATILE_PARAM_RE.search(k)))
+
+def cache_key(request):
+    """
+    Same request -> same key, ignoring session tokens/timestamps in the URL or form body.
+    """
+    parts = urlsplit(request.url)
+    url = urlunsplit((parts.scheme, parts.netloc, parts.path, strip_volatile_params(parts.query), ""))
+    body = strip_volatile_params(request.post_data or "")
+    return hashlib.sha256(f"{request.method} {url} {body}".encode()).hexdigest()
+
+async def cached_route(route, cache_mode):
+    path = os.path.join(HTTP_CACHE_DIR, cache_key(route.request))
+
+    if cache_mode == "replay":
+        if not os.path.exists(path + ".json"):
+            logger.debug(f"Cache miss: {route.request.url}")
+            await route.abort()
+            return
+        with open(path + ".json", encoding="utf-8") as f: meta = json.load(f)
+        with open(path + ".body", "rb") as f: body = f.read()
+        await route.fulfill(status=meta["status"], headers=meta["headers"], body=body)
+        return
+
+    # record
+    response = await route.fetch()
+    body = await response.body()
+    headers = {k: v for k, v in response.headers.items() if k.lower() not in DROPPED_CACHE_HEADERS}
+    os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+    with open(path + ".body", "wb") as f: f.write(body)
+    with open(path + ".json", "w", encoding="utf-8") as f: json.dump({"url": route.request.url, "status": response.status, "headers": headers}, f)
+    await route.fulfill(status=response.status, headers=headers, body=body)
+
+async def wait_for_table_refresh(page, previous_first_row, timeout=15000):
+    """
+    The job table is swapped out by XHR. Instead of sleeping, wait until its first row changes.
+    """
+    try:
+        await page.wait_for_function(TABLE_REFRESHED_JS, arg=previous_first_row, timeout=timeout)
+    except TimeoutError:
+        logger.warning("⚠️ Table did not refresh in time.")
+
+def is_results_response(response):
+    return response.request.resource_type in ("xhr", "fetch") and bool(RESULTS_RESPONSE_RE.search(response.url))
+
+async def go_to_next_page(page, next_btn):
+    """
+    Clicks "next page" and waits for the job-results XHR itself, then for the new rows to render.
+    """
+    previous_first_row = await page.evaluate(FIRST_ROW_JS)
+    try:
+        async with page.expect_response(is_results_response, timeout=20000):
+            await next_btn.click()
+    except TimeoutError:
+        logger.warning("⚠️ No job-results response after paging.")
+    await wait_for_table_refresh(page, previous_first_row, timeout=5000)
+
+async def go_to_page(page, next_btn, current_page, target_page):
+    """
+    Moves from current_page to target_page, jumping over pages through the numbered pager
+    links where it can and only clicking "next" otherwise. Returns the page it ended on.
+    """
+    while current_page < target_page:
+        previous_first_row = await page.evaluate(FIRST_ROW_JS)
+        landed = await page.evaluate(JUMP_TO_PAGE_JS, {"current": current_page, "target": target_page})
+        if landed > current_page:
+            await wait_for_table_refresh(page, previous_first_row)
+            current_page = landed
+        elif await next_btn.is_visible() and "disabled" not in (await next_btn.get_attribute("class") or ""):
+            await go_to_next_page(page, next_btn)
+            current_page += 1
+        else:
+            break
+    return current_page
+
+async def block_heavy_resources(route, cache_mode="off"):
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    elif cache_mode != "off":
+        await cached_route(route, cache_mode)
+    else:
+        await route.continue_()
+
+async def launch_context(p, headless, cache_mode):
+    context = await p.chromium.launch_persistent_context(user_data_dir=PROFILE_DIR, headless=headless, args=BROWSER_ARGS)
+    await context.route("**/*", lambda route: block_heavy_resources(route, cache_mode))
+    await context.route(TRACKER_RE, lambda route: route.abort())
+    page = context.pages[0] if context.pages else await context.new_page()
+    return context, page
+
+async def perform_login(page):
     logger.info("🔒 Initiating Login Sequence...")
-    page.goto(ENTRY_URL)
-    human_delay(2, 3)
+    await page.goto(ENTRY_URL)
+    await human_delay(2, 3)
     if "notLoggedIn" in page.url:
-        page.get_by_role("link", name="Log Into WaterlooWorks").click()
-        human_delay(1, 2)
-        page.get_by_role("link", name="Students/Alumni/Staff").click()
-        human_delay(2, 4)
-    if page.locator("input#userNameInput").is_visible():
-        page.fill("input#userNameInput", USERNAME)
-        if page.is_visible("span#nextButton"):
-            page.click("span#nextButton")
-            human_delay(1, 2)
-        page.fill("input#passwordInput", PASSWORD)
-        page.click("span#submitButton")
-        page.wait_for_url(f"**/{DASHBOARD_URL_PART}", timeout=0) 
+        await page.get_by_role("link", name="Log Into WaterlooWorks").click()
+        await human_delay(1, 2)
+        await page.get_by_role("link", name="Students/Alumni/Staff").click()
+        await human_delay(2, 4)
+    if await page.locator("input#userNameInput").is_visible():
+        await page.fill("input#userNameInput", USERNAME)
+        if await page.is_visible("span#nextButton"):
+            await page.click("span#nextButton")
+            await human_delay(1, 2)
+        await page.fill("input#passwordInput", PASSWORD)
+        await page.click("span#submitButton")
+        await page.wait_for_url(f"**/{DASHBOARD_URL_PART}", timeout=0) 
         logger.info("✅ Login successful!")
-    context.storage_state(path=AUTH_FILE)
 
-def navigate_to_jobs(page):
+async def navigate_to_jobs(page):
     logger.info("🧭 Navigating via Menu...")
     try:
-        page.get_by_role("link", name="Co-op Jobs").click()
-        human_delay(1, 2)
+        await page.get_by_role("link", name="Co-op Jobs").click()
+        await human_delay(1, 2)
         target_link = page.get_by_role("link", name="Full-Cycle Service", exact=True)
-        target_link.wait_for(state="visible") 
-        target_link.click()
+        await target_link.wait_for(state="visible") 
+        await target_link.click()
         logger.info("✅ Arrived at Job List page.")
-        human_delay(3, 5)
+        await human_delay(3, 5)
     except Exception as e:
         logger.error(f"❌ Navigation failed: {e}")
 
-def apply_filters(page):
+async def apply_filters(page):
     """
     Applies filters using the specific HTML structure provided.
     """
@@ -100,115 +287,165 @@ def apply_filters(page):
         # 1. FIND AND CLICK THE BUTTON
         level_btn = page.locator("button.drop-down__btn").filter(has_text="Level").first
         
-        if not level_btn.is_visible():
+        if not await level_btn.is_visible():
             logger.warning("⚠️ Could not find 'Level' button.")
             return
 
         logger.info("Found 'Level' button. Clicking...")
-        level_btn.click()
+        await level_btn.click()
         
         # Wait for dropdown (Using the search input as confirmation)
         try:
-            page.locator("input[placeholder='Options Filter']").wait_for(state="visible", timeout=5000)
+            await page.locator("input[placeholder='Options Filter']").wait_for(state="visible", timeout=5000)
         except:
             logger.warning("⚠️ Dropdown did not open.")
             return
 
         # 2. TOGGLE JUNIOR / INTERMEDIATE
         target_levels = ["Junior", "Intermediate"]
+        states = await page.evaluate(TOGGLE_LEVELS_JS, target_levels)
         
-        for level in target_levels:
-            row = page.locator("li.drop-down__item").filter(has_text=level).first
-            
-            if row.is_visible():
-                is_on = row.locator("i.toggle-on").is_visible()
-                
-                if not is_on:
-                    logger.info(f"🔘 '{level}' is OFF. Clicking to turn ON...")
-                    row.locator("label.toggle--single").click()
-                    time.sleep(0.5)
-                else:
-                    logger.info(f"✅ '{level}' is already ON.")
+        for level, state in states.items():
+            if state == "toggled":
+                logger.info(f"🔘 '{level}' was OFF. Turned it ON.")
+            elif state == "on":
+                logger.info(f"✅ '{level}' is already ON.")
             else:
                 logger.warning(f"⚠️ Could not find filter row for '{level}'")
+        changed = "toggled" in states.values()
 
         # 3. TRIGGER RELOAD
         logger.info("🔄 Closing dropdown to trigger reload...")
-        page.locator("body").click(position={"x": 0, "y": 0})
+        previous_first_row = await page.evaluate(FIRST_ROW_JS)
+        await page.locator("body").click(position={"x": 0, "y": 0})
         
-        logger.info("⏳ Waiting for table to refresh...")
-        time.sleep(5)
+        if changed:
+            logger.info("⏳ Waiting for table to refresh...")
+            await wait_for_table_refresh(page, previous_first_row)
         
     except Exception as e:
         logger.error(f"❌ Error applying filters: {e}")
 
 def extract_text_sections(html_content):
-    soup = BeautifulSoup(html_content, "html.parser")
-    def get_clean_text(label_keyword):
-        label_span = soup.find("span", class_="label", string=lambda t: t and label_keyword in t)
-        if not label_span: return "Not Found"
-        container = label_span.find_parent("div", class_="tag__key-value-list")
-        if container:
-            label_span.decompose()
-            for br in container.find_all("br"): br.replace_with("\n")
-            text = container.get_text(separator="\n", strip=True)
-            return re.sub(r'\n\s*\n', '\n\n', text)
-        return "Not Found"
-    return get_clean_text("Job Summary"), get_clean_text("Job Responsibilities"), get_clean_text("Required Skills")
-
-def scrape_current_page(page, page_num, existing_ids):
+    tree = lxml_html.fromstring(html_content)
+
+    # One walk over the label spans finds the container of all three sections
+    containers = dict.fromkeys(SECTION_LABELS)
+    for span in LABEL_SPAN_XP(tree):
+        label_text = span.text_content()
+        for label in SECTION_LABELS:
+            if containers[label] is None and label in label_text:
+                found = CONTAINER_XP(span)
+                if found: containers[label] = found[0]
+
+    def get_clean_text(container):
+        if container is None: return "Not Found"
+        for label_span in LABEL_SPAN_XP(container): label_span.drop_tree()
+        # itertext() would include script/style contents, which get_text() never showed
+        for el in container.iter("script", "style"): el.text = None
+        # Same as BeautifulSoup's get_text(separator="\n", strip=True). itertext() already
+        # yields the text on either side of a <br> separately, so no <br> rewriting is needed.
+        text = "\n".join(t.strip() for t in container.itertext() if t.strip())
+        return _BLANKLINE_RE.sub('\n\n', text)
+    return tuple(get_clean_text(containers[label]) for label in SECTION_LABELS)
+
+async def read_job_id(page, header_loc):
+    job_id = "N/A"
+    text = await header_loc.inner_text()
+    match = _JOBID_RE.search(text)
+    if match:
+        job_id = match.group(1)
+    else:
+        try:
+            body_id = page.locator("tr", has_text="Job ID").locator("td").last
+            body_match = _JOBID_RE.search(await body_id.inner_text()) if await body_id.is_visible() else None
+            if body_match:
+                job_id = body_match.group(1)
+        except: pass
+    return job_id
+
+async def read_sections(page):
+    # Wait for the posting body (any section) to render, then serialize the page only once.
+    # Not tied to 'Job Summary', so postings without that section don't pay the full timeout.
+    try:
+        await page.locator("div.tag__key-value-list").first.wait_for(state="visible", timeout=3000)
+    except TimeoutError:
+        pass
+    return extract_text_sections(await page.content())
+
+def build_row(job_id, row_data, sections):
+    org, division, openings, city, level = (row_data["cols"] + [""] * 5)[:5]
+    summary, resp, skills = sections
+    return {
+        "Job ID": job_id,
+        "Job Title": row_data["title"],
+        "Organization": org,
+        "Division": division,
+        "Openings": openings,
+        "City": city,
+        "Level": level,
+        "Summary": summary,
+        "Responsibilities": resp,
+        "Skills": skills
+    }
+
+def is_known(row_data, existing_ids):
+    # Posting ID from the row link itself, so duplicates are skipped without opening them
+    return bool(row_data["postingId"]) and row_data["postingId"] in existing_ids
+
+async def scrape_current_page(page, page_num, existing_ids):
     logger.info(f"📄 Scanning Page {page_num}...")
-    handle_keep_alive(page)
+    await handle_keep_alive(page)
     try:
-        page.wait_for_selector("table tbody tr", timeout=20000)
+        await page.wait_for_selector("table tbody tr", timeout=20000)
     except:
         return []
     
-    rows = page.locator("table tbody tr")
-    count = rows.count()
+    # All listing text in one evaluate; Playwright is only used to open the modals
+    listing = await page.evaluate(LISTING_JS)
+    jobs = [row_data for row_data in listing if row_data["title"]]
+    logger.info(f"🔎 Found {len(jobs)} jobs on this page.")
+    missing_ids = sum(1 for row_data in jobs if not row_data["postingId"])
+    if missing_ids:
+        logger.warning(f"⚠️ {missing_ids}/{len(jobs)} rows expose no posting ID; those are only de-duplicated after opening.")
+    known = sum(is_known(row_data, existing_ids) for row_data in jobs)
+    if known:
+        logger.info(f"⏭️ Skipping {known} already-saved jobs without opening them.")
+
+    row_handles = await page.locator("table tbody tr").all()
+    header_loc = page.locator("div.dashboard-header__posting-title")
+    close_btn = page.locator("button.modal__btn--close").first
+    count = len(listing)
     new_data = []
 
-    for i in range(count):
-        if i % 5 == 0: handle_keep_alive(page)
+    for i, row_data in enumerate(listing):
+        if i % 5 == 0: await handle_keep_alive(page)
 
-        row = page.locator("table tbody tr").nth(i)
-        if not row.locator("a").first.is_visible(): continue
+        job_title = row_data["title"]
+        if not job_title or is_known(row_data, existing_ids): continue
 
-        job_link = row.locator("a").first
-        job_title = job_link.inner_text().strip()
-        if not job_title: continue
-
-        # --- CAPTURE COLUMNS 1-5 ---
-        try:
-            tds = row.locator("td")
-            org      = tds.nth(1).inner_text().strip() 
-            division = tds.nth(2).inner_text().strip() 
-            openings = tds.nth(3).inner_text().strip() 
-            city     = tds.nth(4).inner_text().strip() 
-            level    = tds.nth(5).inner_text().strip() 
-        except:
-            org, division, openings, city, level = "", "", "", "", ""
+        job_link = row_handles[i].locator("a").first
 
         logger.info(f"[Pg {page_num} | {i+1}/{count}] {job_title}")
         
-        job_link.scroll_into_view_if_needed()
-        human_delay(0.5, 1)
+        await job_link.scroll_into_view_if_needed()
+        await human_delay(0.5, 1)
 
         # Click with retry
         click_success = False
         for attempt in range(3):
             try:
-                job_link.click(timeout=5000) 
+                await job_link.click(timeout=5000) 
                 click_success = True
                 break
             except TimeoutError:
-                if handle_keep_alive(page):
-                    human_delay(1, 2)
+                if await handle_keep_alive(page):
+                    await human_delay(1, 2)
                     continue
             except Exception as e:
                 if "intercepts pointer events" in str(e):
-                    handle_keep_alive(page)
-                    human_delay(1, 2)
+                    await handle_keep_alive(page)
+                    await human_delay(1, 2)
                 else:
                     break
         
@@ -216,145 +453,164 @@ def scrape_current_page(page, page_num, existing_ids):
             continue
 
         # Wait for Header
-        header_loc = page.locator("div.dashboard-header__posting-title")
-        
         try:
-            header_loc.wait_for(state="visible", timeout=8000)
-            
-            # Extract ID
-            job_id = "N/A"
-            text = header_loc.inner_text()
-            match = re.search(r'(\d{6})', text)
-            if match:
-                job_id = match.group(1)
-            else:
-                try:
-                    body_id = page.locator("tr", has_text="Job ID").locator("td").last
-                    if body_id.is_visible() and re.search(r'\d{6}', body_id.inner_text()):
-                        job_id = re.search(r'(\d{6})', body_id.inner_text()).group(1)
-                except: pass
+            await header_loc.wait_for(state="visible", timeout=8000)
+            job_id = await read_job_id(page, header_loc)
+            if row_data["postingId"] and job_id != "N/A" and row_data["postingId"] != job_id:
+                logger.warning(f"⚠️ Row posting ID {row_data['postingId']} != modal Job ID {job_id}; the pre-click skip can't be trusted.")
 
             if job_id != "N/A" and job_id in existing_ids:
                 logger.info(f"⏭️ Skipping {job_id} (Duplicate).")
-                page.keyboard.press("Escape")
-                human_delay(0.5, 1)
+                await page.keyboard.press("Escape")
+                await human_delay(0.5, 1)
                 continue
             
-            html = page.content()
-            summary, resp, skills = extract_text_sections(html)
-
-            if summary == "Not Found" and job_id != "N/A":
-                time.sleep(1)
-                html = page.content()
-                summary, resp, skills = extract_text_sections(html)
-
-            new_data.append({
-                "Job ID": job_id,
-                "Job Title": job_title,
-                "Organization": org,
-                "Division": division,
-                "Openings": openings,
-                "City": city,
-                "Level": level,
-                "Summary": summary,
-                "Responsibilities": resp,
-                "Skills": skills
-            })
+            new_data.append(build_row(job_id, row_data, await read_sections(page)))
 
         except Exception as e:
             logger.warning(f"⚠️ Popup error: {e}")
 
         # --- GHOST BUTTON FIX ---
-        page.keyboard.press("Escape")
-        time.sleep(0.5)
+        await page.keyboard.press("Escape")
 
         try:
-            if header_loc.is_visible():
-                page.locator("button.modal__btn--close").first.evaluate("el => el.click()")
+            await header_loc.wait_for(state="hidden", timeout=1000)
+        except TimeoutError:
+            pass
+
+        try:
+            if await header_loc.is_visible():
+                await close_btn.evaluate("el => el.click()")
         except:
             pass
             
-        human_delay(1, 2)
+        await human_delay(1, 2)
 
     return new_data
 
-def scrape_all_pages(page, output_file):
-    all_jobs_df = pd.DataFrame()
-    existing_ids = set()
-    start_page = 1
-    
-    # 1. READ EXISTING FILE (To calculate resume point)
-    if os.path.exists(output_file):
-        try:
-            logger.info(f"📂 Found existing file: {output_file}. Resuming...")
-            all_jobs_df = pd.read_excel(output_file)
-            all_jobs_df['Job ID'] = all_jobs_df['Job ID'].astype(str)
-            existing_ids = set(all_jobs_df['Job ID'].tolist())
-            num_existing = len(all_jobs_df)
-            logger.info(f"📊 Loaded {num_existing} existing jobs.")
-            start_page = (num_existing // JOBS_PER_PAGE_GUESS) + 1
-            logger.info(f"⏩ Will fast-forward to Page {start_page} after filters...")
-        except:
-            logger.error("⚠️ Error reading existing file. Starting fresh.")
+def save_checkpoint(checkpoint_dir, page_num, rows):
+    """
+    Writes one page of jobs (list of dicts) as its own small Parquet file inside the checkpoint folder.
+    A file per page means a crash never corrupts what is already saved.
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    table = pa.Table.from_pylist([{col: str(row.get(col, "")) for col in OUTPUT_COLUMNS} for row in rows])
+    pq.write_table(table, os.path.join(checkpoint_dir, f"page_{page_num:04d}_{time.time_ns()}.parquet"))
+
+async def open_job_board(page):
+    """
+    Takes a tab in the (already authenticated) context to the filtered 'All Jobs' list.
+    """
+    if "jobs.htm" not in page.url:
+        await page.goto(f"https://waterlooworks.uwaterloo.ca/{DASHBOARD_URL_PART}")
+        await navigate_to_jobs(page)
 
     logger.info("Attempting to switch to 'All Jobs' view...")
     try:
-        page.get_by_role("button", name="All Jobs").click()
-        human_delay(4, 6) 
+        # If we're already on All Jobs the table doesn't change, so wait on the results XHR (briefly) instead
+        async with page.expect_response(is_results_response, timeout=5000):
+            await page.get_by_role("button", name="All Jobs").click()
+        await page.locator("table tbody tr").first.wait_for(state="attached", timeout=5000)
+    except TimeoutError:
+        logger.info("ℹ️ No reload after 'All Jobs' (probably already in that view).")
     except: pass
     
     # --- CRITICAL CHANGE: ALWAYS APPLY FILTERS ---
     # Apply filters regardless of whether we are resuming or starting fresh.
-    apply_filters(page)
+    await apply_filters(page)
     # ---------------------------------------------
 
-    # 2. FAST FORWARD LOOP
-    current_page = 1
-    while current_page < start_page:
-        logger.info(f"⏩ Skipping Page {current_page}...")
-        next_btn = page.locator("a[aria-label='Go to next page']")
-        if next_btn.is_visible() and "disabled" not in (next_btn.get_attribute("class") or ""):
-            next_btn.click()
-            time.sleep(3) # Wait for table load
-            current_page += 1
-        else:
-            logger.warning("🛑 Could not fast-forward further. End of list?")
-            break
+async def scrape_all_pages(main_page, output_file, num_workers):
+    # Pages are checkpointed to Parquet as we go; the .xlsx is only written at the end
+    checkpoint_dir = os.path.splitext(output_file)[0] + "_checkpoint"
+    existing_ids = set()
+    total_saved = 0
+    start_page = 1
+    
+    # 1. READ EXISTING CHECKPOINT (To calculate resume point)
+    # A newer xlsx (e.g. written by another scraper) wins over a leftover checkpoint
+    if os.path.isdir(checkpoint_dir) and os.path.exists(output_file) and os.path.getmtime(output_file) > os.path.getmtime(checkpoint_dir):
+        logger.info(f"🗑️ {output_file} is newer than {checkpoint_dir}. Discarding the stale checkpoint...")
+        shutil.rmtree(checkpoint_dir)
 
-    # 3. MAIN SCRAPING LOOP
-    while current_page <= MAX_PAGES:
-        handle_keep_alive(page)
-        new_jobs = scrape_current_page(page, current_page, existing_ids)
-        
-        if new_jobs:
-            new_df = pd.DataFrame(new_jobs)
-            new_df['Job ID'] = new_df['Job ID'].astype(str)
-            all_jobs_df = pd.concat([all_jobs_df, new_df], ignore_index=True)
-            
-            # Save Columns in logical order
-            cols = ["Job ID", "Organization", "Job Title", "Division", "City", "Level", "Openings", "Summary", "Responsibilities", "Skills"]
-            all_jobs_df = all_jobs_df[[c for c in cols if c in all_jobs_df.columns]]
-            
-            all_jobs_df.to_excel(output_file, index=False)
-            logger.info(f"💾 SAVED! {len(all_jobs_df)} total jobs.")
-            existing_ids.update(new_df['Job ID'].tolist())
-        else:
-            logger.info(f"ℹ️ Page {current_page} yielded no new jobs.")
+    if not os.path.isdir(checkpoint_dir) and os.path.exists(output_file):
+        try:
+            logger.info(f"📂 Found existing file: {output_file}. Converting it to a checkpoint...")
+            # read_only streams the rows instead of loading the whole workbook
+            wb = openpyxl.load_workbook(output_file, read_only=True, data_only=True)
+            rows = wb.active.iter_rows(values_only=True)
+            header = [str(h) for h in next(rows)]
+            save_checkpoint(checkpoint_dir, 0, [dict(zip(header, ("" if v is None else v for v in row))) for row in rows])
+            wb.close()
+        except:
+            logger.error("⚠️ Error reading existing file. Starting fresh.")
 
-        logger.info("👀 Checking for next page...")
-        next_btn = page.locator("a[aria-label='Go to next page']")
-        if next_btn.is_visible():
-            if "disabled" in (next_btn.get_attribute("class") or ""):
-                break
-            else:
-                next_btn.click()
-                time.sleep(5) 
-                current_page += 1
-        else:
-            break
+    if os.path.isdir(checkpoint_dir):
+        try:
+            logger.info(f"📂 Found checkpoint: {checkpoint_dir}. Resuming...")
+            saved_ids = pq.read_table(checkpoint_dir, columns=["Job ID"]).column("Job ID").to_pylist()
+            existing_ids = set(saved_ids)
+            total_saved = len(saved_ids)
+            logger.info(f"📊 Loaded {total_saved} existing jobs.")
+            start_page = (total_saved // JOBS_PER_PAGE_GUESS) + 1
+            logger.info(f"⏩ Will fast-forward to Page {start_page} after filters...")
+        except:
+            logger.error("⚠️ Error reading checkpoint. Starting fresh.")
+
+    async def save_jobs(page_num, new_jobs):
+        nonlocal total_saved
+        # Plain dicts go straight to Arrow; a DataFrame is only built for the final Excel
+        await asyncio.to_thread(save_checkpoint, checkpoint_dir, page_num, new_jobs)
+        total_saved += len(new_jobs)
+        logger.info(f"💾 SAVED! {total_saved} total jobs.")
+        existing_ids.update(job["Job ID"] for job in new_jobs)
+
+    async def scrape_worker(worker_id):
+        # Worker 0 keeps the tab we logged in with; the rest get their own tab in the shared context
+        page = main_page if worker_id == 0 else await main_page.context.new_page()
+        try:
+            await open_job_board(page)
+            next_btn = page.locator("a[aria-label='Go to next page']")
+
+            # 2. FAST FORWARD: worker k starts k pages after the resume point
+            target_page = start_page + worker_id
+            if target_page > 1:
+                logger.info(f"⏩ [W{worker_id}] Jumping to Page {target_page}...")
+            current_page = await go_to_page(page, next_btn, 1, target_page)
+            if current_page < target_page:
+                return
+
+            # 3. MAIN SCRAPING LOOP: then stride by num_workers
+            while current_page <= MAX_PAGES:
+                await handle_keep_alive(page)
+                new_jobs = await scrape_current_page(page, current_page, existing_ids)
+                
+                if new_jobs:
+                    await save_jobs(current_page, new_jobs)
+                else:
+                    logger.info(f"ℹ️ Page {current_page} yielded no new jobs.")
+
+                logger.info(f"👀 [W{worker_id}] Jumping {num_workers} page(s) ahead...")
+                target_page = current_page + num_workers
+                current_page = await go_to_page(page, next_btn, current_page, target_page)
+                if current_page < target_page:
+                    return
+        finally:
+            if worker_id != 0: await page.close()
+
+    logger.info(f"🚀 Launching {num_workers} parallel workers...")
+    await asyncio.gather(*(scrape_worker(k) for k in range(num_workers)))
+
+    # 4. WRITE THE FINAL EXCEL (once)
+    if os.path.isdir(checkpoint_dir):
+        final_df = pd.read_parquet(checkpoint_dir, engine="pyarrow")
+        final_df.to_excel(output_file, index=False)
+        logger.info(f"💾 Wrote {len(final_df)} jobs to {output_file}.")
+        # The xlsx is the source of truth between runs (deleting it starts fresh), so drop the checkpoint
+        shutil.rmtree(checkpoint_dir)
     logger.info("🎉 Scraping Complete.")
 
-def main():
+async def main():
     args = parse_arguments()
     output_filename = args.output
     
@@ -362,17 +618,23 @@ def main():
         logger.warning(f"⚠️ Filename '{output_filename}' is invalid. Appending '.xlsx'.")
         output_filename += ".xlsx"
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        context = browser.new_context(storage_state=AUTH_FILE) if os.path.exists(AUTH_FILE) else browser.new_context()
-        page = context.new_page()
+    async with async_playwright() as p:
+        context, page = await launch_context(p, args.headless, args.cache_mode)
         try:
-            page.goto(f"https://waterlooworks.uwaterloo.ca/{DASHBOARD_URL_PART}")
-            if "notLoggedIn" in page.url: perform_login(page, context)
-        except: perform_login(page, context)
-        if "jobs.htm" not in page.url: navigate_to_jobs(page)
-        scrape_all_pages(page, output_filename)
-        browser.close()
+            await page.goto(f"https://waterlooworks.uwaterloo.ca/{DASHBOARD_URL_PART}")
+            logged_in = "notLoggedIn" not in page.url
+        except: logged_in = False
+
+        if not logged_in:
+            if args.headless:
+                # 2FA needs a person, so never try to log in without a window
+                logger.warning("⚠️ Saved session expired. Reopening with a window for the 2FA login...")
+                await context.close()
+                context, page = await launch_context(p, False, args.cache_mode)
+            await perform_login(page)
+        if "jobs.htm" not in page.url: await navigate_to_jobs(page)
+        await scrape_all_pages(page, output_filename, max(1, args.workers))
+        await context.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -31,6 +31,8 @@ DASHBOARD_URL_PART = "myAccount/dashboard.htm"
 # SETTINGS
 JOBS_PER_PAGE_GUESS = 50 
 MAX_PAGES = 300 
+# Flush the xlsx every this many pages with new jobs, so a hard crash loses at most this much
+SAVE_EVERY_PAGES = 5
 
 def parse_arguments():
     parser = argparse.ArgumentParser(description="WaterlooWorks Job Scraper")
@@ -301,8 +303,20 @@ def scrape_current_page(page, page_num, existing_ids):
 
     return new_data
 
+def write_output(page_frames, output_file):
+    # One concat over all pages (concatenating on every page re-copies the whole table each time)
+    all_jobs_df = pd.concat(page_frames, ignore_index=True)
+    cols = ["Job ID", "Organization", "Job Title", "Division", "City", "Level", "Openings", "Summary", "Responsibilities", "Skills"]
+    all_jobs_df = all_jobs_df[[c for c in cols if c in all_jobs_df.columns]]
+    all_jobs_df.to_excel(output_file, index=False)
+    logger.info(f"💾 Wrote {len(all_jobs_df)} jobs to {output_file}.")
+    # Keep the merged frame so the next flush only concats the pages added since
+    page_frames[:] = [all_jobs_df]
+
 def scrape_all_pages(page, output_file):
-    all_jobs_df = pd.DataFrame()
+    page_frames = []
+    unsaved_pages = 0
+    total_saved = 0
     existing_ids = set()
     start_page = 1
     
@@ -310,10 +324,12 @@ def scrape_all_pages(page, output_file):
     if os.path.exists(output_file):
         try:
             logger.info(f"📂 Found existing file: {output_file}. Resuming...")
-            all_jobs_df = pd.read_excel(output_file)
-            all_jobs_df['Job ID'] = all_jobs_df['Job ID'].astype(str)
-            existing_ids = set(all_jobs_df['Job ID'].tolist())
-            num_existing = len(all_jobs_df)
+            initial_df = pd.read_excel(output_file)
+            initial_df['Job ID'] = initial_df['Job ID'].astype(str)
+            page_frames.append(initial_df)
+            existing_ids = set(initial_df['Job ID'].tolist())
+            num_existing = len(initial_df)
+            total_saved = num_existing
             logger.info(f"📊 Loaded {num_existing} existing jobs.")
             start_page = (num_existing // JOBS_PER_PAGE_GUESS) + 1
             logger.info(f"⏩ Will fast-forward to Page {start_page} after filters...")
@@ -330,50 +346,54 @@ def scrape_all_pages(page, output_file):
     apply_all_filters(page)
     # ----------------------------------
 
-    # 2. FAST FORWARD LOOP
-    current_page = 1
-    while current_page < start_page:
-        logger.info(f"⏩ Skipping Page {current_page}...")
-        next_btn = page.locator("a[aria-label='Go to next page']")
-        if next_btn.is_visible() and "disabled" not in (next_btn.get_attribute("class") or ""):
-            next_btn.click()
-            time.sleep(3) 
-            current_page += 1
-        else:
-            logger.warning("🛑 Could not fast-forward further. End of list?")
-            break
-
-    # 3. MAIN SCRAPING LOOP
-    while current_page <= MAX_PAGES:
-        handle_keep_alive(page)
-        new_jobs = scrape_current_page(page, current_page, existing_ids)
-        
-        if new_jobs:
-            new_df = pd.DataFrame(new_jobs)
-            new_df['Job ID'] = new_df['Job ID'].astype(str)
-            all_jobs_df = pd.concat([all_jobs_df, new_df], ignore_index=True)
-            
-            # Save Columns
-            cols = ["Job ID", "Organization", "Job Title", "Division", "City", "Level", "Openings", "Summary", "Responsibilities", "Skills"]
-            all_jobs_df = all_jobs_df[[c for c in cols if c in all_jobs_df.columns]]
-            
-            all_jobs_df.to_excel(output_file, index=False)
-            logger.info(f"💾 SAVED! {len(all_jobs_df)} total jobs.")
-            existing_ids.update(new_df['Job ID'].tolist())
-        else:
-            logger.info(f"ℹ️ Page {current_page} yielded no new jobs.")
-
-        logger.info("👀 Checking for next page...")
-        next_btn = page.locator("a[aria-label='Go to next page']")
-        if next_btn.is_visible():
-            if "disabled" in (next_btn.get_attribute("class") or ""):
-                break
-            else:
+    try:
+        # 2. FAST FORWARD LOOP
+        current_page = 1
+        while current_page < start_page:
+            logger.info(f"⏩ Skipping Page {current_page}...")
+            next_btn = page.locator("a[aria-label='Go to next page']")
+            if next_btn.is_visible() and "disabled" not in (next_btn.get_attribute("class") or ""):
                 next_btn.click()
-                time.sleep(5) 
+                time.sleep(3) 
                 current_page += 1
-        else:
-            break
+            else:
+                logger.warning("🛑 Could not fast-forward further. End of list?")
+                break
+
+        # 3. MAIN SCRAPING LOOP
+        while current_page <= MAX_PAGES:
+            handle_keep_alive(page)
+            new_jobs = scrape_current_page(page, current_page, existing_ids)
+            
+            if new_jobs:
+                new_df = pd.DataFrame(new_jobs)
+                new_df['Job ID'] = new_df['Job ID'].astype(str)
+                page_frames.append(new_df)
+                unsaved_pages += 1
+                total_saved += len(new_df)
+                logger.info(f"📥 Collected! {total_saved} total jobs.")
+                if unsaved_pages >= SAVE_EVERY_PAGES:
+                    write_output(page_frames, output_file)
+                    unsaved_pages = 0
+                existing_ids.update(new_df['Job ID'].tolist())
+            else:
+                logger.info(f"ℹ️ Page {current_page} yielded no new jobs.")
+
+            logger.info("👀 Checking for next page...")
+            next_btn = page.locator("a[aria-label='Go to next page']")
+            if next_btn.is_visible():
+                if "disabled" in (next_btn.get_attribute("class") or ""):
+                    break
+                else:
+                    next_btn.click()
+                    time.sleep(5) 
+                    current_page += 1
+            else:
+                break
+    finally:
+        # Final write (also if the run dies part-way, so the next run can resume)
+        if unsaved_pages:
+            write_output(page_frames, output_file)
     logger.info("🎉 Scraping Complete.")
 
 def main():
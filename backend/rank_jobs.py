@@ -1,7 +1,10 @@
 import os
 import json
+import math
 import logging
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 import google.generativeai as genai
 from dotenv import load_dotenv
 
@@ -14,10 +17,17 @@ MODEL_NAME = "gemini-3-pro-preview"
 
 INPUT_FILE = "scraped_jobs.xlsx"
 OUTPUT_FILE = "picked_jobs.xlsx"
+# Parquet checkpoint folder written by jobhunter_g.py (used instead of the xlsx when it is newer)
+CHECKPOINT_DIR = "scraped_jobs_checkpoint"
 
 # MAX number of jobs to pick (it can pick fewer)
 TOP_N = 5 
 
+# Big job lists are ranked in chunks of this many jobs, then the winners are ranked again
+CHUNK_SIZE = 200
+# Chunks sent to Gemini at the same time
+MAX_WORKERS = 4
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 logger = logging.getLogger()
 
@@ -34,9 +44,7 @@ PROJECTS:
 SKILLS: Python, C++, Java, SQL, React, ROS, Git, Docker, OpenCV, Pandas.
 """
 
-def rank_jobs(df, top_n):
-    logger.info(f"📊 AI ({MODEL_NAME}) is analyzing {len(df)} jobs...")
-
+def ask_model(df, top_n):
     jobs_summary_text = ""
     for index, row in df.iterrows():
         clean_summary = str(row['Summary']).replace('\n', ' ')[:400]
@@ -80,13 +88,46 @@ def rank_jobs(df, top_n):
         logger.error(f"❌ Ranking failed: {e}")
         return None
 
+def rank_jobs(df, top_n):
+    logger.info(f"📊 AI ({MODEL_NAME}) is analyzing {len(df)} jobs...")
+    if len(df) <= CHUNK_SIZE:
+        return ask_model(df, top_n)
+
+    # 1. Rank each chunk on its own (short prompts, and one failed chunk doesn't lose the rest)
+    chunks = [df.iloc[idx] for idx in np.array_split(np.arange(len(df)), math.ceil(len(df) / CHUNK_SIZE))]
+    logger.info(f"✂️ Split into {len(chunks)} chunks of ~{CHUNK_SIZE} jobs...")
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        results = list(pool.map(lambda chunk: ask_model(chunk, top_n), chunks))
+
+    candidate_ids = {str(x).strip() for result in results if result for x in result.get("top_ids", [])}
+    if not candidate_ids:
+        if all(result is None for result in results):
+            return None
+        return {"top_ids": [], "reasoning": "No chunk produced a strong fit."}
+
+    # 2. Final "top of tops" round over only the chunk winners
+    candidates_df = df[df['_jid'].isin(candidate_ids)]
+    logger.info(f"🏁 Final round over {len(candidates_df)} candidates...")
+    return ask_model(candidates_df, top_n)
+
+def load_jobs():
+    # A leftover checkpoint must not hide a newer xlsx written by one of the other scrapers
+    if os.path.isdir(CHECKPOINT_DIR) and (
+        not os.path.exists(INPUT_FILE) or os.path.getmtime(CHECKPOINT_DIR) > os.path.getmtime(INPUT_FILE)
+    ):
+        logger.info(f"📂 Reading checkpoint {CHECKPOINT_DIR} (newer than {INPUT_FILE})...")
+        return pd.read_parquet(CHECKPOINT_DIR, engine="pyarrow")
+    return pd.read_excel(INPUT_FILE)
+
 def main():
-    if not os.path.exists(INPUT_FILE):
+    if not os.path.isdir(CHECKPOINT_DIR) and not os.path.exists(INPUT_FILE):
         logger.error(f"❌ {INPUT_FILE} not found. Run jobhunter.py first.")
         return
 
-    df = pd.read_excel(INPUT_FILE)
+    df = load_jobs()
     df['Job ID'] = df['Job ID'].astype(str)
+    # Stripped IDs, computed once and reused for every lookup
+    df['_jid'] = df['Job ID'].str.strip()
 
     result = rank_jobs(df, TOP_N)
     
@@ -108,8 +149,8 @@ def main():
     print(f"IDs Selected: {top_ids}")
     print("="*50 + "\n")
 
-    clean_top_ids = [str(x).strip() for x in top_ids]
-    picked_df = df[df['Job ID'].str.strip().isin(clean_top_ids)]
+    wanted = frozenset(str(x).strip() for x in top_ids)
+    picked_df = df[df['_jid'].isin(wanted)].drop(columns='_jid')
 
     if picked_df.empty:
         logger.warning("⚠️ No rows matched the returned IDs. Check formatting.")